@@ -10,7 +10,7 @@ License: MIT
 import csv
 import os
 import logging
-from typing import List, Dict, Tuple
+from typing import Dict, Iterator, List, TextIO, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -53,9 +53,24 @@ class CSVParser:
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"CSV file not found: {filepath}")
 
+        with open(filepath, 'r', encoding='utf-8') as file:
+            return self.parse_stream(file)
+
+    def parse_stream(self, stream: TextIO) -> Tuple[List[str], List[Dict[str, str]]]:
+        """
+        Parse CSV data from an open text stream and return headers and rows.
+
+        Args:
+            stream: Readable text stream (open file, io.StringIO, ...)
+
+        Returns:
+            Tuple containing list of headers and list of row dictionaries
+
+        Raises:
+            ValueError: If the stream is empty or malformed
+        """
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                content = file.read()
+            content = stream.read()
 
             # Try with utf-8-sig to handle BOM if present
             if content.startswith('\ufeff'):
@@ -80,6 +95,29 @@ class CSVParser:
             logger.error(f"Error parsing CSV file: {e}")
             raise
 
+    def iter_rows(self, filepath: str) -> Iterator[Dict[str, str]]:
+        """
+        Lazily yield the rows of a CSV file as dictionaries.
+
+        Unlike parse_file, rows are read on demand, so the whole file is
+        never held in memory.
+
+        Args:
+            filepath: Path to the CSV file
+
+        Yields:
+            Row dictionaries keyed by header
+
+        Raises:
+            FileNotFoundError: If file doesn't exist (on first iteration)
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"CSV file not found: {filepath}")
+
+        # utf-8-sig drops the BOM if present
+        with open(filepath, 'r', encoding='utf-8-sig', newline='') as file:
+            yield from csv.DictReader(file, delimiter=self.delimiter)
+
     def normalize_amount(self, amount_str: str) -> float:
         """
         Convert amount string to float, handling different decimal separators.
@@ -10,7 +10,7 @@ Author: Generated for Brazilian banking compatibility
 License: MIT
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from .csv_parser import CSVParser
 from .date_validator import DateValidator
 from .constants import NOT_SELECTED, NOT_MAPPED
@@ -125,6 +125,10 @@ class BalanceManager:
         desc_col = field_mappings.get('description', NOT_MAPPED)
         type_col = field_mappings.get('type', NOT_MAPPED)
         use_composite = any(col != NOT_SELECTED for col in description_columns)
+        # The mapping is fixed for the whole preview, so specialize once
+        build_description = transaction_utils.make_description_builder(
+            desc_col, description_columns, description_separator, use_composite
+        )
 
         # Create parser
         parser = CSVParser(
@@ -156,11 +160,8 @@ class BalanceManager:
                 parser=parser,
                 date_col=date_col,
                 amount_col=amount_col,
-                desc_col=desc_col,
                 type_col=type_col,
-                use_composite=use_composite,
-                description_columns=description_columns,
-                description_separator=description_separator,
+                build_description=build_description,
                 invert_values=invert_values,
                 date_validator=date_validator
             )
@@ -199,11 +200,8 @@ class BalanceManager:
         parser: CSVParser,
         date_col: str,
         amount_col: str,
-        desc_col: str,
         type_col: str,
-        use_composite: bool,
-        description_columns: List[str],
-        description_separator: str,
+        build_description: Callable[[Dict[str, str]], str],
         invert_values: bool,
         date_validator: Optional[DateValidator]
     ) -> Optional[Dict]:
@@ -215,11 +213,9 @@ class BalanceManager:
             parser: CSVParser instance
             date_col: Date column name
             amount_col: Amount column name
-            desc_col: Description column name
             type_col: Type column name
-            use_composite: Whether to use composite description
-            description_columns: List of columns for composite description
-            description_separator: Separator for composite description
+            build_description: Description builder from
+                transaction_utils.make_description_builder()
             invert_values: Whether to invert values
             date_validator: DateValidator instance or None
 
@@ -230,14 +226,7 @@ class BalanceManager:
             date = row[date_col]
             amount = parser.normalize_amount(row[amount_col])
 
-            # Build description using transaction_utils
-            description = transaction_utils.build_transaction_description(
-                row=row,
-                desc_col=desc_col,
-                description_columns=description_columns,
-                separator=description_separator,
-                use_composite=use_composite
-            )
+            description = build_description(row)
 
             # Apply value inversion if enabled
             if invert_values:
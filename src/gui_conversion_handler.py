@@ -211,6 +211,13 @@ class ConversionHandler:
         use_composite = any(
             col != NOT_SELECTED for col in config.description_columns
         )
+        # The mapping is fixed for the whole file, so specialize once
+        build_description = transaction_utils.make_description_builder(
+            desc_col,
+            config.description_columns,
+            config.description_separator,
+            use_composite
+        )
 
         stats = {
             'total_rows': len(config.csv_data),
@@ -230,9 +237,7 @@ class ConversionHandler:
             try:
                 date = row[date_col]
                 amount = parser.normalize_amount(row[amount_col])
-                description = self._build_description(
-                    config, row, desc_col, use_composite
-                )
+                description = build_description(row)
 
                 date, date_stats = self._validate_and_adjust_date(
                     config, date, row_idx, description, date_validator
@@ -266,33 +271,6 @@ class ConversionHandler:
 
         return stats
 
-    def _build_description(
-        self,
-        config: ConversionConfig,
-        row: Dict[str, str],
-        desc_col: str,
-        use_composite: bool
-    ) -> str:
-        """
-        Build transaction description from single or multiple columns.
-
-        Args:
-            config: ConversionConfig with description settings
-            row: CSV row data
-            desc_col: Description column name
-            use_composite: Whether to use composite description
-
-        Returns:
-            Transaction description string
-        """
-        return transaction_utils.build_transaction_description(
-            row=row,
-            desc_col=desc_col,
-            description_columns=config.description_columns,
-            separator=config.description_separator,
-            use_composite=use_composite
-        )
-
     def _validate_and_adjust_date(
         self,
         config: ConversionConfig,
@@ -10,14 +10,123 @@ Author: Generated for Brazilian banking compatibility
 License: MIT
 """
 
+import functools
 import logging
 from datetime import datetime
-from typing import Optional
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Optional, TextIO
 
 from .transaction_utils import generate_deterministic_fitid
 
 logger = logging.getLogger(__name__)
 
+# Maximum MEMO length written to the OFX file
+_MAX_MEMO = 255
+
+# Supported date formats grouped by separator, in order of preference
+_DATE_FORMATS_BY_SEPARATOR = (
+    ('-', ('%Y-%m-%d',      # 2025-10-22
+           '%d-%m-%Y')),    # 22-10-2025
+    ('/', ('%d/%m/%Y',      # 22/10/2025
+           '%m/%d/%Y',      # 10/22/2025
+           '%Y/%m/%d')),    # 2025/10/22
+    ('.', ('%d.%m.%Y',)),   # 22.10.2025
+)
+_COMPACT_DATE_FORMATS = ('%Y%m%d',)  # 20251022
+
+# Document sections around the transaction list; static lines are joined
+# once here and only the fields are filled in per generate call
+_OFX_HEAD_TEMPLATE = '\n'.join([
+    "OFXHEADER:100",
+    "DATA:OFXSGML",
+    "VERSION:102",
+    "SECURITY:NONE",
+    "ENCODING:USASCII",
+    "CHARSET:1252",
+    "COMPRESSION:NONE",
+    "OLDFILEUID:NONE",
+    "NEWFILEUID:NONE",
+    "<OFX>",
+    "<SIGNONMSGSRSV1>",
+    "<SONRS>",
+    "<STATUS>",
+    "<CODE>0</CODE>",
+    "<SEVERITY>INFO</SEVERITY>",
+    "</STATUS>",
+    "<DTSERVER>{timestamp}</DTSERVER>",
+    "<LANGUAGE>POR</LANGUAGE>",
+    "<FI>",
+    "<ORG>{bank_name}</ORG>",
+    "<FID>0</FID>",
+    "</FI>",
+    "</SONRS>",
+    "</SIGNONMSGSRSV1>",
+    "<CREDITCARDMSGSRSV1>",
+    "<CCSTMTTRNRS>",
+    "<TRNUID>1001</TRNUID>",
+    "<STATUS>",
+    "<CODE>0</CODE>",
+    "<SEVERITY>INFO</SEVERITY>",
+    "</STATUS>",
+    "<CCSTMTRS>",
+    "<CURDEF>{currency}</CURDEF>",
+    "<CCACCTFROM>",
+    "<ACCTID>{account_id}</ACCTID>",
+    "</CCACCTFROM>",
+    "<BANKTRANLIST>",
+    "<DTSTART>{start_date}</DTSTART>",
+    "<DTEND>{end_date}</DTEND>",
+])
+
+_OFX_TAIL_TEMPLATE = '\n'.join([
+    "</BANKTRANLIST>",
+    "<LEDGERBAL>",
+    "<BALAMT>{final_balance:.2f}</BALAMT>",
+    "<DTASOF>{end_date}</DTASOF>",
+    "</LEDGERBAL>",
+    "<AVAILBAL>",
+    "<BALAMT>{initial_balance:.2f}</BALAMT>",
+    "<DTASOF>{start_date}</DTASOF>",
+    "</AVAILBAL>",
+    "</CCSTMTRS>",
+    "</CCSTMTTRNRS>",
+    "</CREDITCARDMSGSRSV1>",
+    "</OFX>",
+])
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_ofx_date(date_str: str) -> str:
+    """
+    Convert a date string to OFX format, caching the result.
+
+    Statements repeat the same dates many times, so each distinct string
+    goes through the strptime formats only once. See
+    OFXGenerator._parse_date for the accepted formats.
+    """
+    date_str = date_str.strip()
+    parsed_date = None
+
+    # Only try the formats that use the separator found in the string
+    for separator, date_formats in _DATE_FORMATS_BY_SEPARATOR:
+        if separator in date_str:
+            break
+    else:
+        date_formats = _COMPACT_DATE_FORMATS
+
+    for fmt in date_formats:
+        try:
+            parsed_date = datetime.strptime(date_str, fmt)
+            break
+        except ValueError:
+            continue
+
+    if parsed_date is None:
+        raise ValueError(f"Unrecognized date format: {date_str}")
+
+    # Format: YYYYMMDD000000[-3:BRT]
+    return f"{parsed_date.strftime('%Y%m%d')}000000[-3:BRT]"
+
 
 class OFXGenerator:
     """
@@ -38,6 +147,10 @@ class OFXGenerator:
         self.invert_values = invert_values
         logger.info(f"OFXGenerator initialized (invert_values={invert_values})")
 
+    def reset(self):
+        """Remove all added transactions so the generator can be reused."""
+        self.transactions.clear()
+
     def add_transaction(self, date: str, amount: float, description: str,
                        transaction_type: str = 'DEBIT', transaction_id: Optional[str] = None):
         """
@@ -51,6 +164,9 @@ class OFXGenerator:
             transaction_id: Unique transaction ID (deterministic UUID generated if not provided)
         """
         parsed_date = self._parse_date(date)
+        # Limit description length
+        memo = description if len(description) <= _MAX_MEMO else description[:_MAX_MEMO]
+
         # Apply value inversion if enabled
         if self.invert_values:
             amount = -amount
@@ -69,7 +185,7 @@ class OFXGenerator:
             transaction_id = generate_deterministic_fitid(
                 date=parsed_date,  # Already in OFX format YYYYMMDD000000[-3:BRT]
                 amount=amount,  # Already adjusted for type and inversion
-                memo=description[:255],  # Already truncated
+                memo=memo,  # Already truncated
                 account_id="",  # Not available in add_transaction, could be added later
                 disambiguation=""  # No disambiguation for v1
             )
@@ -79,12 +195,23 @@ class OFXGenerator:
             'date': parsed_date,
             'amount': amount,
             'id': transaction_id,
-            'memo': description[:255]  # Limit description length
+            'memo': memo
         }
 
         self.transactions.append(transaction)
         logger.debug(f"Transaction added: {transaction}")
 
+    def add_transactions(self, transactions: Iterable[Dict[str, Any]]):
+        """
+        Add several transactions at once.
+
+        Args:
+            transactions: Iterable of dicts holding add_transaction keyword arguments
+        """
+        add_transaction = self.add_transaction
+        for transaction in transactions:
+            add_transaction(**transaction)
+
     def _parse_date(self, date_str: str) -> str:
         """
         Parse various date formats and convert to OFX format (YYYYMMDD000000).
@@ -98,46 +225,26 @@ class OFXGenerator:
         Raises:
             ValueError: If date format is not recognized
         """
-        # Common date formats
-        date_formats = [
-            '%Y-%m-%d',      # 2025-10-22
-            '%d/%m/%Y',      # 22/10/2025
-            '%m/%d/%Y',      # 10/22/2025
-            '%Y/%m/%d',      # 2025/10/22
-            '%d-%m-%Y',      # 22-10-2025
-            '%d.%m.%Y',      # 22.10.2025
-            '%Y%m%d',        # 20251022
-        ]
-
-        date_str = date_str.strip()
-        parsed_date = None
-
-        for fmt in date_formats:
-            try:
-                parsed_date = datetime.strptime(date_str, fmt)
-                break
-            except ValueError:
-                continue
-
-        if parsed_date is None:
-            raise ValueError(f"Unrecognized date format: {date_str}")
-
-        # Format: YYYYMMDD000000[-3:BRT]
-        return f"{parsed_date.strftime('%Y%m%d')}000000[-3:BRT]"
+        return _parse_ofx_date(date_str)
 
-    def generate(self, output_path: str, account_id: str = "UNKNOWN",
+    def generate(self, output_path: Optional[str] = None, account_id: str = "UNKNOWN",
                 bank_name: str = "CSV Import", currency: str = "BRL",
-                initial_balance: float = 0.0, final_balance: Optional[float] = None):
+                initial_balance: float = 0.0, final_balance: Optional[float] = None,
+                output: Optional[TextIO] = None) -> str:
         """
         Generate OFX file with all added transactions.
 
         Args:
-            output_path: Path where OFX file will be saved
+            output_path: Path where OFX file will be saved (if None, no file is written)
             account_id: Account identifier
             bank_name: Name of the financial institution
             currency: Currency code (default: BRL for Brazilian Real)
             initial_balance: Starting balance (default: 0.0)
             final_balance: Ending balance (if None, will be calculated from transactions)
+            output: Optional writable text stream that also receives the OFX content
+
+        Returns:
+            The generated OFX content
 
         Raises:
             ValueError: If no transactions have been added
@@ -148,7 +255,7 @@ class OFXGenerator:
         # Sort transactions by date (already in OFX format YYYYMMDD, so string sort works)
         # Note: Transactions should already be added in sorted order from preview,
         # but we sort here as a safeguard
-        self.transactions.sort(key=lambda x: x['date'])
+        self.transactions.sort(key=itemgetter('date'))
 
         # Get date range
         start_date = self.transactions[0]['date']
@@ -169,13 +276,18 @@ class OFXGenerator:
             start_date, end_date, initial_balance, final_balance
         )
 
-        # Write to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(ofx_content)
+        # Write to file and/or stream
+        if output_path is not None:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(ofx_content)
+        if output is not None:
+            output.write(ofx_content)
 
-        logger.info(f"OFX file generated: {output_path} ({len(self.transactions)} transactions, "
+        logger.info(f"OFX generated: {output_path or 'in memory'} ({len(self.transactions)} transactions, "
                    f"initial={initial_balance:.2f}, final={final_balance:.2f})")
 
+        return ofx_content
+
     def _build_ofx_content(self, timestamp: str, bank_name: str,
                           account_id: str, currency: str,
                           start_date: str, end_date: str,
@@ -196,75 +308,29 @@ class OFXGenerator:
         Returns:
             Complete OFX file content as string
         """
-        lines = [
-            "OFXHEADER:100",
-            "DATA:OFXSGML",
-            "VERSION:102",
-            "SECURITY:NONE",
-            "ENCODING:USASCII",
-            "CHARSET:1252",
-            "COMPRESSION:NONE",
-            "OLDFILEUID:NONE",
-            "NEWFILEUID:NONE",
-            "<OFX>",
-            "<SIGNONMSGSRSV1>",
-            "<SONRS>",
-            "<STATUS>",
-            "<CODE>0</CODE>",
-            "<SEVERITY>INFO</SEVERITY>",
-            "</STATUS>",
-            f"<DTSERVER>{timestamp}</DTSERVER>",
-            "<LANGUAGE>POR</LANGUAGE>",
-            "<FI>",
-            f"<ORG>{bank_name}</ORG>",
-            "<FID>0</FID>",
-            "</FI>",
-            "</SONRS>",
-            "</SIGNONMSGSRSV1>",
-            "<CREDITCARDMSGSRSV1>",
-            "<CCSTMTTRNRS>",
-            "<TRNUID>1001</TRNUID>",
-            "<STATUS>",
-            "<CODE>0</CODE>",
-            "<SEVERITY>INFO</SEVERITY>",
-            "</STATUS>",
-            "<CCSTMTRS>",
-            f"<CURDEF>{currency}</CURDEF>",
-            "<CCACCTFROM>",
-            f"<ACCTID>{account_id}</ACCTID>",
-            "</CCACCTFROM>",
-            "<BANKTRANLIST>",
-            f"<DTSTART>{start_date}</DTSTART>",
-            f"<DTEND>{end_date}</DTEND>",
+        parts = [
+            _OFX_HEAD_TEMPLATE.format(
+                timestamp=timestamp, bank_name=bank_name, currency=currency,
+                account_id=account_id, start_date=start_date, end_date=end_date
+            )
         ]
 
         # Add all transactions
-        for transaction in self.transactions:
-            lines.extend([
-                "<STMTTRN>",
-                f"<TRNTYPE>{transaction['type']}</TRNTYPE>",
-                f"<DTPOSTED>{transaction['date']}</DTPOSTED>",
-                f"<TRNAMT>{transaction['amount']:.2f}</TRNAMT>",
-                f"<FITID>{transaction['id']}</FITID>",
-                f"<MEMO>{transaction['memo']}</MEMO>",
-                "</STMTTRN>",
-            ])
+        parts.extend([
+            f"<STMTTRN>\n"
+            f"<TRNTYPE>{trans['type']}</TRNTYPE>\n"
+            f"<DTPOSTED>{trans['date']}</DTPOSTED>\n"
+            f"<TRNAMT>{trans['amount']:.2f}</TRNAMT>\n"
+            f"<FITID>{trans['id']}</FITID>\n"
+            f"<MEMO>{trans['memo']}</MEMO>\n"
+            f"</STMTTRN>"
+            for trans in self.transactions
+        ])
 
         # Close tags and add balance information
-        lines.extend([
-            "</BANKTRANLIST>",
-            "<LEDGERBAL>",
-            f"<BALAMT>{final_balance:.2f}</BALAMT>",
-            f"<DTASOF>{end_date}</DTASOF>",
-            "</LEDGERBAL>",
-            "<AVAILBAL>",
-            f"<BALAMT>{initial_balance:.2f}</BALAMT>",
-            f"<DTASOF>{start_date}</DTASOF>",
-            "</AVAILBAL>",
-            "</CCSTMTRS>",
-            "</CCSTMTTRNRS>",
-            "</CREDITCARDMSGSRSV1>",
-            "</OFX>",
-        ])
+        parts.append(_OFX_TAIL_TEMPLATE.format(
+            start_date=start_date, end_date=end_date,
+            initial_balance=initial_balance, final_balance=final_balance
+        ))
 
-        return '\n'.join(lines)
+        return '\n'.join(parts)
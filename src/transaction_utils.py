@@ -14,8 +14,11 @@ Author: Generated for Brazilian banking compatibility
 License: MIT
 """
 
+import functools
+import hashlib
+import re
 import uuid
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Sequence, Tuple
 from .constants import NOT_MAPPED, NOT_SELECTED
 
 # Application-specific namespace for deterministic FITID generation
@@ -25,6 +28,20 @@ NAMESPACE_CSV_TO_OFX = uuid.uuid5(
     "csv-to-ofx-converter.local"
 )
 
+# SHA-1 state over the namespace bytes, the fixed prefix of every UUID v5
+# name hash; copied per FITID instead of rehashing the namespace each time
+_NAMESPACE_SHA1 = hashlib.sha1(NAMESPACE_CSV_TO_OFX.bytes)
+
+# Transaction types accepted from a mapped type column
+_VALID_TYPES = frozenset(('DEBIT', 'CREDIT'))
+
+# Plain decimal or scientific notation accepted by parse_balance_value;
+# like float(), single underscores may separate digits ('1_000')
+_DIGITS = r'\d(?:_?\d)*'
+_NUMBER_RE = re.compile(
+    rf'[+-]?(?:{_DIGITS}\.?(?:{_DIGITS})?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?'
+)
+
 
 def build_transaction_description(
     row: Dict[str, str],
@@ -57,17 +74,66 @@ def build_transaction_description(
     if use_composite:
         desc_parts = []
         for col_name in description_columns:
-            if col_name != NOT_SELECTED and col_name in row:
+            if col_name in row and col_name != NOT_SELECTED:
                 value = row[col_name].strip()
                 if value:
                     desc_parts.append(value)
-        description = separator.join(desc_parts)
-        return description if description else "Transaction"
+        return separator.join(desc_parts) or "Transaction"
 
     # Use single description column
     return row.get(desc_col, "Transaction")
 
 
+def make_description_builder(
+    desc_col: str,
+    description_columns: List[str],
+    separator: str,
+    use_composite: bool
+) -> Callable[[Dict[str, str]], str]:
+    """
+    Create a description builder specialized for a fixed column mapping.
+
+    Callers converting many rows with one mapping create the builder once
+    and call it per row, so the NOT_SELECTED filtering and the
+    composite/single decision are not repeated for every row.
+
+    Args:
+        desc_col: Name of the description column (used if not composite)
+        description_columns: List of column names to combine for composite description
+        separator: String to join column values
+        use_composite: If True, use composite description; otherwise use desc_col
+
+    Returns:
+        Function taking a row dictionary and returning the same description
+        as build_transaction_description() would for that row.
+
+    Examples:
+        >>> build = make_description_builder('memo', ['memo', 'vendor'], ' - ', True)
+        >>> build({'memo': 'Purchase', 'vendor': 'Store'})
+        'Purchase - Store'
+    """
+    if not use_composite:
+        # Use single description column
+        def build_single(row: Dict[str, str]) -> str:
+            return row.get(desc_col, "Transaction")
+        return build_single
+
+    columns = tuple(
+        col_name for col_name in description_columns if col_name != NOT_SELECTED
+    )
+    join = separator.join
+
+    def build_composite(row: Dict[str, str]) -> str:
+        desc_parts = []
+        for col_name in columns:
+            if col_name in row:
+                value = row[col_name].strip()
+                if value:
+                    desc_parts.append(value)
+        return join(desc_parts) or "Transaction"
+    return build_composite
+
+
 def determine_transaction_type(
     type_col: str,
     row: Dict[str, str],
@@ -99,7 +165,7 @@ def determine_transaction_type(
     """
     if type_col != NOT_MAPPED and type_col in row:
         trans_type = row[type_col].upper()
-        if trans_type in ['DEBIT', 'CREDIT']:
+        if trans_type in _VALID_TYPES:
             return trans_type
 
     # Infer from amount sign
@@ -168,11 +234,38 @@ def calculate_balance_summary(
         >>> result['calculated_final_balance']
         1075.0
     """
+    amounts = [trans.get('amount', 0.0) for trans in transactions]
+    return calculate_balance_summary_from_amounts(amounts, initial_balance)
+
+
+def calculate_balance_summary_from_amounts(
+    amounts: Sequence[float],
+    initial_balance: float
+) -> Dict[str, float]:
+    """
+    Calculate balance summary from a flat sequence of amounts.
+
+    Same result as calculate_balance_summary(), but takes the amounts
+    column directly (a list or an array('d')) so callers that already hold
+    the amounts do not need to build one dictionary per transaction.
+
+    Args:
+        amounts: Sequence of transaction amounts
+        initial_balance: Starting balance before transactions
+
+    Returns:
+        Dictionary with the same keys as calculate_balance_summary()
+
+    Examples:
+        >>> result = calculate_balance_summary_from_amounts(
+        ...     [100.0, -50.0, 25.0], 1000.0)
+        >>> result['calculated_final_balance']
+        1075.0
+    """
     total_credits = 0.0
     total_debits = 0.0
 
-    for trans in transactions:
-        amount = trans.get('amount', 0.0)
+    for amount in amounts:
         if amount >= 0:
             total_credits += amount
         else:
@@ -185,7 +278,7 @@ def calculate_balance_summary(
         'total_credits': total_credits,
         'total_debits': total_debits,
         'calculated_final_balance': calculated_final_balance,
-        'transaction_count': len(transactions)
+        'transaction_count': len(amounts)
     }
 
 
@@ -214,7 +307,8 @@ def validate_field_mappings(
         (False, "Required field 'description' is not mapped")
     """
     for field in required_fields:
-        if field not in field_mappings or field_mappings[field] == NOT_MAPPED:
+        # A missing field counts as NOT_MAPPED (one dict lookup per field)
+        if field_mappings.get(field, NOT_MAPPED) == NOT_MAPPED:
             return False, f"Required field '{field}' is not mapped"
 
     return True, None
@@ -224,7 +318,10 @@ def parse_balance_value(balance_str: str, default: float = 0.0) -> float:
     """
     Parse balance string to float, with fallback to default value.
 
-    Handles empty strings, whitespace, and invalid numeric formats.
+    Handles empty strings, whitespace, and invalid numeric formats. Only
+    plain decimal or scientific notation is accepted (digits may be
+    grouped with underscores, as float() allows, e.g. '1_000'), so values
+    such as 'nan' or 'inf' also fall back to the default.
 
     Args:
         balance_str: String representation of balance
@@ -244,10 +341,30 @@ def parse_balance_value(balance_str: str, default: float = 0.0) -> float:
         100.0
     """
     try:
-        return float(balance_str.strip() or str(default))
-    except (ValueError, AttributeError):
+        value = balance_str.strip() or str(default)
+    except AttributeError:
         return default
 
+    # Reject non-numeric text up front instead of raising inside float()
+    if _NUMBER_RE.fullmatch(value):
+        return float(value)
+    return default
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_fitid_date(date: str) -> str:
+    """
+    Normalize a FITID date to YYYYMMDD when it is in OFX datetime format.
+
+    Rows in a statement share few distinct dates, so each one is
+    normalized once and then served from the cache.
+    """
+    date_normalized = date.strip()
+    # Detect OFX datetime format: YYYYMMDD000000[-3:BRT]
+    if date_normalized.startswith("000000", 8):
+        date_normalized = date_normalized[:8]
+    return date_normalized
+
 
 def generate_deterministic_fitid(
     date: str,
@@ -291,11 +408,7 @@ def generate_deterministic_fitid(
         >>> id_a != id_b
         True
     """
-    # Normalize date: Extract YYYYMMDD portion if in OFX format
-    date_normalized = date.strip()
-    # Detect OFX datetime format: YYYYMMDD000000[-3:BRT]
-    if len(date_normalized) >= 14 and date_normalized[8:14] == "000000":
-        date_normalized = date_normalized[:8]
+    date_normalized = _normalize_fitid_date(date)
 
     # Normalize amount: Format to 2 decimal places
     amount_normalized = f"{amount:.2f}"
@@ -315,5 +428,12 @@ def generate_deterministic_fitid(
     # Create deterministic string
     data_string = "|".join(components)
 
-    # Generate UUID v5 from normalized data
-    return str(uuid.uuid5(NAMESPACE_CSV_TO_OFX, data_string))
+    # Generate UUID v5 from normalized data: same as uuid.uuid5(), but the
+    # namespace bytes are already absorbed into the copied hash state
+    digest = _NAMESPACE_SHA1.copy()
+    digest.update(data_string.encode('utf-8'))
+    uuid_bytes = bytearray(digest.digest()[:16])
+    uuid_bytes[6] = (uuid_bytes[6] & 0x0F) | 0x50  # version 5
+    uuid_bytes[8] = (uuid_bytes[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = uuid_bytes.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
@@ -6,11 +6,28 @@ Unit Tests for CSVParser
 Test cases for CSV parsing functionality.
 """
 
+import io
 import unittest
 import os
+import shutil
 import tempfile
 from src.csv_to_ofx_converter import CSVParser
 
+# CSV files written as raw bytes by the tests
+STANDARD_CSV = b"""date,amount,description
+2025-10-01,100.50,Purchase 1
+2025-10-02,-50.25,Refund 1
+2025-10-03,200.00,Purchase 2"""
+
+BRAZILIAN_CSV = b"""data;valor;descricao
+01/10/2025;100,50;Compra 1
+02/10/2025;-50,25;Reembolso 1
+03/10/2025;200,00;Compra 2"""
+
+# UTF-8 BOM followed by the header row
+BOM_CSV = b"\xef\xbb\xbfdate,amount,description\n2025-10-01,100.50,Purchase"
+BRAZILIAN_BOM_CSV = b"\xef\xbb\xbfdata;valor\n01/10/2025;100,50\n02/10/2025;-50,25"
+
 
 class TestCSVParser(unittest.TestCase):
     """Test cases for CSV Parser."""
@@ -21,20 +38,13 @@ class TestCSVParser(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test files."""
-        for file in os.listdir(self.temp_dir):
-            os.remove(os.path.join(self.temp_dir, file))
-        os.rmdir(self.temp_dir)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
 
     def test_standard_csv_parsing(self):
         """Test parsing standard CSV format (comma-separated, dot decimal)."""
-        csv_content = """date,amount,description
-2025-10-01,100.50,Purchase 1
-2025-10-02,-50.25,Refund 1
-2025-10-03,200.00,Purchase 2"""
-
         csv_file = os.path.join(self.temp_dir, 'test.csv')
-        with open(csv_file, 'w') as f:
-            f.write(csv_content)
+        with open(csv_file, 'wb') as f:
+            f.write(STANDARD_CSV)
 
         parser = CSVParser(delimiter=',', decimal_separator='.')
         headers, rows = parser.parse_file(csv_file)
@@ -46,14 +56,9 @@ class TestCSVParser(unittest.TestCase):
 
     def test_brazilian_csv_parsing(self):
         """Test parsing Brazilian CSV format (semicolon-separated, comma decimal)."""
-        csv_content = """data;valor;descricao
-01/10/2025;100,50;Compra 1
-02/10/2025;-50,25;Reembolso 1
-03/10/2025;200,00;Compra 2"""
-
         csv_file = os.path.join(self.temp_dir, 'test_br.csv')
-        with open(csv_file, 'w', encoding='utf-8') as f:
-            f.write(csv_content)
+        with open(csv_file, 'wb') as f:
+            f.write(BRAZILIAN_CSV)
 
         parser = CSVParser(delimiter=';', decimal_separator=',')
         headers, rows = parser.parse_file(csv_file)
@@ -127,16 +132,43 @@ class TestCSVParser(unittest.TestCase):
 
     def test_csv_with_bom(self):
         """Test parsing CSV file with BOM (Byte Order Mark)."""
-        csv_content = "\ufeffdate,amount,description\n2025-10-01,100.50,Purchase"
         csv_file = os.path.join(self.temp_dir, 'test_bom.csv')
-        with open(csv_file, 'w', encoding='utf-8') as f:
-            f.write(csv_content)
+        with open(csv_file, 'wb') as f:
+            f.write(BOM_CSV)
 
         parser = CSVParser()
         headers, rows = parser.parse_file(csv_file)
 
         self.assertEqual(headers[0], 'date')  # BOM should be removed
 
+    def test_iter_rows(self):
+        """Test lazily iterating the rows of a CSV file."""
+        csv_file = os.path.join(self.temp_dir, 'test_iter.csv')
+        with open(csv_file, 'wb') as f:
+            f.write(BRAZILIAN_BOM_CSV)
+
+        parser = CSVParser(delimiter=';', decimal_separator=',')
+        rows = parser.iter_rows(csv_file)
+
+        self.assertEqual(next(rows), {'data': '01/10/2025', 'valor': '100,50'})
+        self.assertEqual(list(rows), [{'data': '02/10/2025', 'valor': '-50,25'}])
+
+        with self.assertRaises(FileNotFoundError):
+            next(parser.iter_rows('/nonexistent/file.csv'))
+
+    def test_parse_stream(self):
+        """Test parsing CSV data from an in-memory stream."""
+        stream = io.StringIO("\ufeffdata;valor\n01/10/2025;100,50")
+
+        parser = CSVParser(delimiter=';', decimal_separator=',')
+        headers, rows = parser.parse_stream(stream)
+
+        self.assertEqual(headers, ['data', 'valor'])
+        self.assertEqual(rows, [{'data': '01/10/2025', 'valor': '100,50'}])
+
+        with self.assertRaises(ValueError):
+            parser.parse_stream(io.StringIO(''))
+
 
 if __name__ == '__main__':
     unittest.main()
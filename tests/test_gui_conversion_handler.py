@@ -11,6 +11,7 @@ and error handling without requiring a GUI display server.
 import unittest
 import tempfile
 import os
+import shutil
 from src.gui_conversion_handler import ConversionHandler, ConversionConfig
 from src.constants import NOT_MAPPED, NOT_SELECTED
 
@@ -107,9 +108,7 @@ class TestConversionHandler(unittest.TestCase):
 
     def tearDown(self):
         """Clean up temporary files."""
-        for filename in os.listdir(self.temp_dir):
-            os.remove(os.path.join(self.temp_dir, filename))
-        os.rmdir(self.temp_dir)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
 
     def test_conversion_handler_initialization(self):
         """Test ConversionHandler initialization with parent GUI."""
@@ -6,141 +6,245 @@ Integration Tests for CSV to OFX Converter
 Test cases for the complete conversion process.
 """
 
+import io
+import mmap
 import unittest
 import os
-import re
+import shutil
 import tempfile
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from src.csv_to_ofx_converter import CSVParser, OFXGenerator
+from src.transaction_utils import build_transaction_description
 
+# Column mappings used by TestIntegration._convert
+DESCRIPTION_COLUMNS = {'date': 'date', 'amount': 'amount', 'description': 'description'}
+STANDARD_COLUMNS = dict(DESCRIPTION_COLUMNS, type='type')
+BRAZILIAN_COLUMNS_NO_TYPE = {'date': 'data', 'amount': 'valor', 'description': 'descricao'}
+BRAZILIAN_COLUMNS = dict(BRAZILIAN_COLUMNS_NO_TYPE, type='tipo')
 
-class TestIntegration(unittest.TestCase):
-    """Integration tests for the complete conversion process."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-
-    def tearDown(self):
-        """Clean up test files."""
-        for file in os.listdir(self.temp_dir):
-            os.remove(os.path.join(self.temp_dir, file))
-        os.rmdir(self.temp_dir)
-
-    def test_complete_conversion_standard_format(self):
-        """Test complete conversion from CSV to OFX (standard format)."""
-        # Create test CSV
-        csv_content = """date,amount,description,type
+STANDARD_CSV = """date,amount,description,type
 2025-10-01,-100.50,Purchase 1,DEBIT
 2025-10-02,-50.25,Purchase 2,DEBIT
 2025-10-03,1000.00,Salary,CREDIT"""
 
-        csv_file = os.path.join(self.temp_dir, 'test.csv')
-        with open(csv_file, 'w') as f:
-            f.write(csv_content)
+BRAZILIAN_CSV = """data;valor;descricao;tipo
+01/10/2025;-100,50;Compra 1;DEBIT
+02/10/2025;-50,25;Compra 2;DEBIT
+03/10/2025;1.000,00;Salário;CREDIT"""
 
-        # Parse CSV
-        parser = CSVParser(delimiter=',', decimal_separator='.')
-        headers, rows = parser.parse_file(csv_file)
+FITID_CSV = """date,amount,description
+2025-10-01,-100.50,Restaurant Purchase
+2025-10-02,-50.25,Gas Station
+2025-10-03,1000.00,Salary Payment"""
 
-        # Generate OFX
-        generator = OFXGenerator()
-        for row in rows:
-            generator.add_transaction(
-                date=row['date'],
-                amount=parser.normalize_amount(row['amount']),
-                description=row['description'],
-                transaction_type=row['type']
-            )
+BRAZILIAN_FITID_CSV = """data;valor;descricao
+01/10/2025;-100,50;Restaurante
+02/10/2025;-50,25;Posto de Gasolina
+03/10/2025;1.000,00;Salário"""
 
-        output_file = os.path.join(self.temp_dir, 'output.ofx')
-        generator.generate(
-            output_path=output_file,
-            account_id='TEST123',
-            bank_name='Test Bank'
-        )
+# Written to disk as raw bytes by test_value_inversion_integration
+INVERSION_CSV = b"""date,amount,description
+2025-10-01,100.50,Expense (should be negative)
+2025-10-02,50.25,Expense (should be negative)
+2025-10-03,-1000.00,Income (should be positive)"""
 
-        # Verify output
-        self.assertTrue(os.path.exists(output_file))
+SEPARATOR_CSV = """date,col1,col2,col3,amount
+2025-10-01,A,B,C,-100"""
 
-        with open(output_file, 'r') as f:
-            content = f.read()
+# Rows that differ in exactly one FITID input each
+DISTINCT_FITID_CSV = """date,amount,description
+2025-10-01,-100.50,Purchase A
+2025-10-01,-100.50,Purchase B
+2025-10-01,-200.50,Purchase A
+2025-10-02,-100.50,Purchase A"""
 
-        self.assertIn('<ACCTID>TEST123</ACCTID>', content)
-        self.assertIn('<MEMO>Purchase 1</MEMO>', content)
-        self.assertIn('<MEMO>Purchase 2</MEMO>', content)
-        self.assertIn('<MEMO>Salary</MEMO>', content)
+EXPLICIT_ID_CSV = """date,amount,description,id
+2025-10-01,-100.50,Purchase 1,CUSTOM-ID-001
+2025-10-02,-50.25,Purchase 2,CUSTOM-ID-002
+2025-10-03,1000.00,Salary,CUSTOM-ID-003"""
 
-    def test_complete_conversion_brazilian_format(self):
-        """Test complete conversion from CSV to OFX (Brazilian format)."""
-        # Create test CSV
-        csv_content = """data;valor;descricao;tipo
-01/10/2025;-100,50;Compra 1;DEBIT
-02/10/2025;-50,25;Compra 2;DEBIT
-03/10/2025;1.000,00;Salário;CREDIT"""
+INVERSION_FITID_CSV = """date,amount,description
+2025-10-01,100.50,Expense
+2025-10-02,50.25,Purchase"""
 
-        csv_file = os.path.join(self.temp_dir, 'test_br.csv')
-        with open(csv_file, 'w', encoding='utf-8') as f:
-            f.write(csv_content)
+# Columns combined by test_composite_description
+COMPOSITE_COLUMNS = ('category', 'merchant', 'notes')
 
-        # Parse CSV
-        parser = CSVParser(delimiter=';', decimal_separator=',')
-        headers, rows = parser.parse_file(csv_file)
+COMPOSITE_CSV = """date,category,merchant,notes,amount
+2025-10-01,Food,Restaurant ABC,Business lunch,-75.50
+2025-10-02,Transport,Uber,Airport trip,-25.00
+2025-10-03,Salary,Company XYZ,Monthly payment,3000.00"""
 
-        # Generate OFX
-        generator = OFXGenerator()
-        for row in rows:
-            generator.add_transaction(
-                date=row['data'],
-                amount=parser.normalize_amount(row['valor']),
-                description=row['descricao'],
-                transaction_type=row['tipo']
-            )
+# January statement rows; the first three form the Jan 1-15 export
+JANUARY_HEADER = 'date,amount,description'
+JANUARY_ROWS = [
+    '2025-01-05,-100.50,Restaurant',
+    '2025-01-10,-50.25,Gas Station',
+    '2025-01-15,1000.00,Salary',
+    '2025-01-20,-75.00,Shopping',
+    '2025-01-25,-125.50,Utilities',
+]
 
-        output_file = os.path.join(self.temp_dir, 'output_br.ofx')
-        generator.generate(
-            output_path=output_file,
-            account_id='BR123',
-            bank_name='Banco Teste',
-            currency='BRL'
-        )
 
-        # Verify output
-        self.assertTrue(os.path.exists(output_file))
+def _ram_backed_temp_base():
+    """Return /dev/shm when it is a writable tmpfs, else None (system default)."""
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
 
-        with open(output_file, 'r') as f:
-            content = f.read()
 
-        self.assertIn('<CURDEF>BRL</CURDEF>', content)
-        self.assertIn('<MEMO>Compra 1</MEMO>', content)
-        self.assertIn('<TRNAMT>-100.50</TRNAMT>', content)
-        self.assertIn('<TRNAMT>1000.00</TRNAMT>', content)
+TEMP_BASE_DIR = _ram_backed_temp_base()
 
-    def test_composite_description(self):
-        """Test composite description feature (NEW in v2.0)."""
-        # Create test CSV with multiple columns for description
-        csv_content = """date,category,merchant,notes,amount
-2025-10-01,Food,Restaurant ABC,Business lunch,-75.50
-2025-10-02,Transport,Uber,Airport trip,-25.00
-2025-10-03,Salary,Company XYZ,Monthly payment,3000.00"""
 
-        csv_file = os.path.join(self.temp_dir, 'test_composite.csv')
-        with open(csv_file, 'w') as f:
-            f.write(csv_content)
+def _extract_fitids(content):
+    """Return the FITID values of an OFX document, in document order."""
+    return [part.split('</FITID>', 1)[0] for part in content.split('<FITID>')[1:]]
 
-        # Parse CSV
-        parser = CSVParser(delimiter=',', decimal_separator='.')
-        headers, rows = parser.parse_file(csv_file)
+
+class TestIntegration(unittest.TestCase):
+    """Integration tests for the complete conversion process."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the temp dir shared by the on-disk tests."""
+        cls.temp_dir = tempfile.mkdtemp(dir=TEMP_BASE_DIR)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test files."""
+        shutil.rmtree(cls.temp_dir)
+
+    def assertFileContains(self, path, *needles):
+        """
+        Assert that the file at path contains every byte string in needles.
+
+        The file is memory-mapped instead of read into a Python object, so
+        large generated OFX files are scanned without copying them.
+        """
+        with open(path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for needle in needles:
+                self.assertNotEqual(mapped.find(needle), -1,
+                                    f"{needle!r} not found in {path}")
+
+    def _parse(self, csv_content, delimiter=',', decimal_separator='.'):
+        """
+        Parse csv_content from an in-memory stream.
+
+        Returns:
+            Tuple of (CSVParser, rows)
+        """
+        parser = CSVParser(delimiter=delimiter, decimal_separator=decimal_separator)
+        headers, rows = parser.parse_stream(io.StringIO(csv_content))
+        return parser, rows
+
+    def _generate(self, parser, rows, columns, invert_values=False, **generate_kwargs):
+        """
+        Feed parsed rows to a new OFXGenerator and generate the OFX in memory.
+
+        Args:
+            parser: CSVParser used to normalize amounts
+            rows: Parsed CSV rows
+            columns: Mapping of add_transaction field ('date', 'amount',
+                'description' and optionally 'type' or 'id') to CSV column
+            invert_values: Passed to OFXGenerator
+            **generate_kwargs: Passed to OFXGenerator.generate
+
+        Returns:
+            Generated OFX content
+        """
+        # add_transaction keyword -> CSV column (amount is normalized separately)
+        fields = {'date': columns['date'], 'description': columns['description']}
+        if 'type' in columns:
+            fields['transaction_type'] = columns['type']
+        if 'id' in columns:
+            fields['transaction_id'] = columns['id']
+        amount_column = columns['amount']
+
+        generator = OFXGenerator(invert_values=invert_values)
+        generator.add_transactions(
+            dict({field: row[column] for field, column in fields.items()},
+                 amount=parser.normalize_amount(row[amount_column]))
+            for row in rows
+        )
+
+        return generator.generate(**generate_kwargs)
+
+    def _convert(self, csv_content, columns, delimiter=',', decimal_separator='.',
+                 invert_values=False, **generate_kwargs):
+        """
+        Run csv_content through CSVParser and OFXGenerator.
+
+        Args:
+            csv_content: CSV text to convert
+            columns: Column mapping, see _generate
+            delimiter: CSV delimiter
+            decimal_separator: Decimal separator for amounts
+            invert_values: Passed to OFXGenerator
+            **generate_kwargs: Passed to OFXGenerator.generate
+
+        Returns:
+            Generated OFX content
+        """
+        parser, rows = self._parse(csv_content, delimiter, decimal_separator)
+        return self._generate(parser, rows, columns, invert_values, **generate_kwargs)
+
+    def test_complete_conversion(self):
+        """Test complete conversion from CSV to OFX (standard and Brazilian formats)."""
+        cases = {
+            'standard': {
+                'params': {
+                    'csv_content': STANDARD_CSV,
+                    'columns': STANDARD_COLUMNS,
+                    'account_id': 'TEST123',
+                    'bank_name': 'Test Bank',
+                },
+                'expected': [
+                    '<ACCTID>TEST123</ACCTID>',
+                    '<MEMO>Purchase 1</MEMO>',
+                    '<MEMO>Purchase 2</MEMO>',
+                    '<MEMO>Salary</MEMO>',
+                ],
+            },
+            'brazilian': {
+                'params': {
+                    'csv_content': BRAZILIAN_CSV,
+                    'columns': BRAZILIAN_COLUMNS,
+                    'delimiter': ';',
+                    'decimal_separator': ',',
+                    'account_id': 'BR123',
+                    'bank_name': 'Banco Teste',
+                    'currency': 'BRL',
+                },
+                'expected': [
+                    '<CURDEF>BRL</CURDEF>',
+                    '<MEMO>Compra 1</MEMO>',
+                    '<TRNAMT>-100.50</TRNAMT>',
+                    '<TRNAMT>1000.00</TRNAMT>',
+                ],
+            },
+        }
+
+        for name, case in cases.items():
+            with self.subTest(name=name):
+                content = self._convert(**case['params'])
+                for needle in case['expected']:
+                    self.assertIn(needle, content)
+
+    def test_composite_description(self):
+        """Test composite description feature (NEW in v2.0)."""
+        # Parse CSV with multiple columns for description
+        parser, rows = self._parse(COMPOSITE_CSV)
 
         # Generate OFX with composite descriptions
         generator = OFXGenerator()
         for row in rows:
-            # Simulate composite description: combine category, merchant, and notes
-            description_parts = []
-            for col in ['category', 'merchant', 'notes']:
-                if row[col].strip():
-                    description_parts.append(row[col].strip())
-            composite_description = ' - '.join(description_parts)
+            # Combine category, merchant, and notes as the GUI does
+            composite_description = build_transaction_description(
+                row, 'description', COMPOSITE_COLUMNS, ' - ', use_composite=True
+            )
 
             amount = parser.normalize_amount(row['amount'])
             generator.add_transaction(
@@ -150,41 +254,32 @@ class TestIntegration(unittest.TestCase):
                 transaction_type='DEBIT' if amount < 0 else 'CREDIT'
             )
 
-        output_file = os.path.join(self.temp_dir, 'output_composite.ofx')
         generator.generate(
-            output_path=output_file,
             account_id='TEST123',
             bank_name='Test Bank'
         )
 
-        # Verify output
-        with open(output_file, 'r') as f:
-            content = f.read()
-
-        # Check composite descriptions
-        self.assertIn('<MEMO>Food - Restaurant ABC - Business lunch</MEMO>', content)
-        self.assertIn('<MEMO>Transport - Uber - Airport trip</MEMO>', content)
-        self.assertIn('<MEMO>Salary - Company XYZ - Monthly payment</MEMO>', content)
+        # Check composite descriptions on the generated transactions
+        memos = [t['memo'] for t in generator.transactions]
+        self.assertEqual(memos, [
+            'Food - Restaurant ABC - Business lunch',
+            'Transport - Uber - Airport trip',
+            'Salary - Company XYZ - Monthly payment',
+        ])
 
     def test_value_inversion_integration(self):
         """Test value inversion in complete workflow (NEW in v2.0)."""
-        # Create test CSV with positive expenses (should be inverted)
-        csv_content = """date,amount,description
-2025-10-01,100.50,Expense (should be negative)
-2025-10-02,50.25,Expense (should be negative)
-2025-10-03,-1000.00,Income (should be positive)"""
-
+        # Kept on disk to cover the iter_rows -> generate(output_path) round trip
+        # Test CSV with positive expenses (should be inverted)
         csv_file = os.path.join(self.temp_dir, 'test_invert.csv')
-        with open(csv_file, 'w') as f:
-            f.write(csv_content)
+        with open(csv_file, 'wb') as f:
+            f.write(INVERSION_CSV)
 
-        # Parse CSV
         parser = CSVParser(delimiter=',', decimal_separator='.')
-        headers, rows = parser.parse_file(csv_file)
 
-        # Generate OFX with value inversion
+        # Stream the CSV rows into an OFX generator with value inversion
         generator = OFXGenerator(invert_values=True)
-        for row in rows:
+        for row in parser.iter_rows(csv_file):
             amount = parser.normalize_amount(row['amount'])
             generator.add_transaction(
                 date=row['date'],
@@ -200,26 +295,17 @@ class TestIntegration(unittest.TestCase):
             bank_name='Test Bank'
         )
 
-        # Verify output
-        with open(output_file, 'r') as f:
-            content = f.read()
-
-        # Check inverted amounts
-        self.assertIn('<TRNAMT>-100.50</TRNAMT>', content)  # Was 100.50
-        self.assertIn('<TRNAMT>-50.25</TRNAMT>', content)   # Was 50.25
-        self.assertIn('<TRNAMT>1000.00</TRNAMT>', content)  # Was -1000.00
+        # Verify inverted amounts in the written file
+        self.assertFileContains(
+            output_file,
+            b'<TRNAMT>-100.50</TRNAMT>',  # Was 100.50
+            b'<TRNAMT>-50.25</TRNAMT>',   # Was 50.25
+            b'<TRNAMT>1000.00</TRNAMT>'   # Was -1000.00
+        )
 
     def test_composite_description_with_different_separators(self):
         """Test composite descriptions with various separators (NEW in v2.0)."""
-        csv_content = """date,col1,col2,col3,amount
-2025-10-01,A,B,C,-100"""
-
-        csv_file = os.path.join(self.temp_dir, 'test_sep.csv')
-        with open(csv_file, 'w') as f:
-            f.write(csv_content)
-
-        parser = CSVParser(delimiter=',', decimal_separator='.')
-        headers, rows = parser.parse_file(csv_file)
+        parser, rows = self._parse(SEPARATOR_CSV)
 
         # Test different separators
         separators = {
@@ -229,120 +315,69 @@ class TestIntegration(unittest.TestCase):
             ' | ': 'A | B | C'
         }
 
+        row = rows[0]
+        generator = OFXGenerator()
         for sep, expected_desc in separators.items():
-            generator = OFXGenerator()
-            row = rows[0]
-
-            description_parts = [row['col1'], row['col2'], row['col3']]
-            composite_description = sep.join(description_parts)
-
-            generator.add_transaction(
-                date=row['date'],
-                amount=parser.normalize_amount(row['amount']),
-                description=composite_description
-            )
-
-            output_file = os.path.join(
-                self.temp_dir, f'output_sep_{len(generator.transactions)}.ofx'
-            )
-            generator.generate(output_path=output_file, account_id='TEST')
-
-            with open(output_file, 'r') as f:
-                content = f.read()
-
-            self.assertIn(f'<MEMO>{expected_desc}</MEMO>', content)
-
-    def test_deterministic_fitid_consistency(self):
-        """Test that same transaction data produces same FITID across multiple conversions."""
-        # Create test CSV with consistent data
-        csv_content = """date,amount,description
-2025-10-01,-100.50,Restaurant Purchase
-2025-10-02,-50.25,Gas Station
-2025-10-03,1000.00,Salary Payment"""
-
-        csv_file = os.path.join(self.temp_dir, 'test_fitid.csv')
-        with open(csv_file, 'w') as f:
-            f.write(csv_content)
-
-        # Parse CSV
-        parser = CSVParser(delimiter=',', decimal_separator='.')
-        headers, rows = parser.parse_file(csv_file)
-
-        # Generate OFX twice with same data
-        fitids_first = []
-        fitids_second = []
-
-        for run in range(2):
-            generator = OFXGenerator()
-            for row in rows:
+            with self.subTest(separator=sep):
+                generator.reset()
                 generator.add_transaction(
                     date=row['date'],
                     amount=parser.normalize_amount(row['amount']),
-                    description=row['description']
+                    description=build_transaction_description(
+                        row, 'description', ['col1', 'col2', 'col3'], sep, True
+                    )
                 )
 
-            output_file = os.path.join(self.temp_dir, f'output_fitid_{run}.ofx')
-            generator.generate(
-                output_path=output_file,
-                account_id='TEST123',
-                bank_name='Test Bank'
-            )
+                content = generator.generate(account_id='TEST')
+                self.assertIn(f'<MEMO>{expected_desc}</MEMO>', content)
 
-            # Extract FITIDs from generated file
-            with open(output_file, 'r') as f:
-                content = f.read()
-                fitids = re.findall(r'<FITID>(.*?)</FITID>', content)
-                if run == 0:
-                    fitids_first = fitids
-                else:
-                    fitids_second = fitids
-
-        # Verify FITIDs are identical across both runs
-        self.assertEqual(len(fitids_first), 3, "Should have 3 transactions")
-        self.assertEqual(len(fitids_second), 3, "Should have 3 transactions")
-        self.assertEqual(fitids_first, fitids_second, "FITIDs should be deterministic")
-
-        # Verify FITIDs are valid UUIDs
-        for fitid in fitids_first:
-            try:
-                uuid.UUID(fitid)
-            except ValueError:
-                self.fail(f"Invalid UUID format: {fitid}")
+    def test_deterministic_fitid_consistency(self):
+        """Test that same transaction data produces same FITID across multiple conversions."""
+        cases = {
+            'standard': {
+                'csv_content': FITID_CSV,
+                'columns': DESCRIPTION_COLUMNS,
+                'account_id': 'TEST123',
+                'bank_name': 'Test Bank',
+            },
+            'brazilian': {
+                'csv_content': BRAZILIAN_FITID_CSV,
+                'columns': BRAZILIAN_COLUMNS_NO_TYPE,
+                'delimiter': ';',
+                'decimal_separator': ',',
+                'account_id': 'BR123',
+                'bank_name': 'Banco Teste',
+                'currency': 'BRL',
+            },
+        }
+
+        for name, params in cases.items():
+            with self.subTest(name=name):
+                # Generate OFX twice with same data; the runs are independent,
+                # so they also check the generators can run concurrently
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    fitids_first, fitids_second = executor.map(
+                        lambda _: _extract_fitids(self._convert(**params)), range(2)
+                    )
+
+                # Verify FITIDs are identical across both runs
+                self.assertEqual(len(fitids_first), 3, "Should have 3 transactions")
+                self.assertEqual(fitids_first, fitids_second, "FITIDs should be deterministic")
+
+                # Verify FITIDs are valid UUIDs
+                for fitid in fitids_first:
+                    try:
+                        uuid.UUID(fitid)
+                    except ValueError:
+                        self.fail(f"Invalid UUID format: {fitid}")
 
     def test_deterministic_fitid_different_data(self):
         """Test that different transaction data produces different FITIDs."""
-        csv_content = """date,amount,description
-2025-10-01,-100.50,Purchase A
-2025-10-01,-100.50,Purchase B
-2025-10-01,-200.50,Purchase A
-2025-10-02,-100.50,Purchase A"""
-
-        csv_file = os.path.join(self.temp_dir, 'test_diff.csv')
-        with open(csv_file, 'w') as f:
-            f.write(csv_content)
-
-        parser = CSVParser(delimiter=',', decimal_separator='.')
-        headers, rows = parser.parse_file(csv_file)
-
-        generator = OFXGenerator()
-        for row in rows:
-            generator.add_transaction(
-                date=row['date'],
-                amount=parser.normalize_amount(row['amount']),
-                description=row['description']
-            )
-
-        output_file = os.path.join(self.temp_dir, 'output_different.ofx')
-        generator.generate(
-            output_path=output_file,
-            account_id='TEST123',
-            bank_name='Test Bank'
+        content = self._convert(
+            DISTINCT_FITID_CSV, DESCRIPTION_COLUMNS,
+            account_id='TEST123', bank_name='Test Bank'
         )
-
-        # Extract FITIDs
-        with open(output_file, 'r') as f:
-            content = f.read()
-            fitids = re.findall(r'<FITID>(.*?)</FITID>', content)
+        fitids = _extract_fitids(content)
 
         # Verify all FITIDs are unique (different data = different IDs)
         self.assertEqual(len(fitids), 4, "Should have 4 transactions")
@@ -350,113 +385,38 @@ class TestIntegration(unittest.TestCase):
 
     def test_deterministic_fitid_backward_compatibility(self):
         """Test that explicit transaction IDs are preserved (backward compatibility)."""
-        csv_content = """date,amount,description,id
-2025-10-01,-100.50,Purchase 1,CUSTOM-ID-001
-2025-10-02,-50.25,Purchase 2,CUSTOM-ID-002
-2025-10-03,1000.00,Salary,CUSTOM-ID-003"""
-
-        csv_file = os.path.join(self.temp_dir, 'test_explicit_id.csv')
-        with open(csv_file, 'w') as f:
-            f.write(csv_content)
-
-        parser = CSVParser(delimiter=',', decimal_separator='.')
-        headers, rows = parser.parse_file(csv_file)
-
-        generator = OFXGenerator()
-        for row in rows:
-            generator.add_transaction(
-                date=row['date'],
-                amount=parser.normalize_amount(row['amount']),
-                description=row['description'],
-                transaction_id=row['id']  # Explicit ID provided
-            )
-
-        output_file = os.path.join(self.temp_dir, 'output_explicit.ofx')
-        generator.generate(
-            output_path=output_file,
-            account_id='TEST123',
-            bank_name='Test Bank'
+        # Explicit ID provided through the 'id' column
+        content = self._convert(
+            EXPLICIT_ID_CSV, dict(DESCRIPTION_COLUMNS, id='id'),
+            account_id='TEST123', bank_name='Test Bank'
         )
 
         # Verify explicit IDs are preserved
-        with open(output_file, 'r') as f:
-            content = f.read()
-
-        self.assertIn('<FITID>CUSTOM-ID-001</FITID>', content)
-        self.assertIn('<FITID>CUSTOM-ID-002</FITID>', content)
-        self.assertIn('<FITID>CUSTOM-ID-003</FITID>', content)
+        for needle in [
+            '<FITID>CUSTOM-ID-001</FITID>',
+            '<FITID>CUSTOM-ID-002</FITID>',
+            '<FITID>CUSTOM-ID-003</FITID>',
+        ]:
+            self.assertIn(needle, content)
 
     def test_deterministic_fitid_partial_file_regeneration(self):
         """Test use case: regenerating partial CSV files produces consistent FITIDs."""
         # Simulate user exporting January 1-15, then January 1-31
         # Transactions from Jan 1-15 should have same FITIDs in both exports
 
-        # First export: Jan 1-15
-        csv_content_partial = """date,amount,description
-2025-01-05,-100.50,Restaurant
-2025-01-10,-50.25,Gas Station
-2025-01-15,1000.00,Salary"""
-
-        csv_file_partial = os.path.join(self.temp_dir, 'jan_1_15.csv')
-        with open(csv_file_partial, 'w') as f:
-            f.write(csv_content_partial)
-
-        parser = CSVParser(delimiter=',', decimal_separator='.')
-        headers, rows_partial = parser.parse_file(csv_file_partial)
-
-        generator_partial = OFXGenerator()
-        for row in rows_partial:
-            generator_partial.add_transaction(
-                date=row['date'],
-                amount=parser.normalize_amount(row['amount']),
-                description=row['description']
-            )
-
-        output_partial = os.path.join(self.temp_dir, 'jan_1_15.ofx')
-        generator_partial.generate(
-            output_path=output_partial,
-            account_id='TEST123',
-            bank_name='Test Bank'
-        )
+        parser, rows_full = self._parse('\n'.join([JANUARY_HEADER] + JANUARY_ROWS))
 
-        # Extract FITIDs from partial export
-        with open(output_partial, 'r') as f:
-            content_partial = f.read()
-            fitids_partial = re.findall(r'<FITID>(.*?)</FITID>', content_partial)
+        # First export: Jan 1-15
+        fitids_partial = _extract_fitids(self._generate(
+            parser, rows_full[:3], DESCRIPTION_COLUMNS,
+            account_id='TEST123', bank_name='Test Bank'
+        ))
 
         # Second export: Jan 1-31 (includes all previous transactions plus new ones)
-        csv_content_full = """date,amount,description
-2025-01-05,-100.50,Restaurant
-2025-01-10,-50.25,Gas Station
-2025-01-15,1000.00,Salary
-2025-01-20,-75.00,Shopping
-2025-01-25,-125.50,Utilities"""
-
-        csv_file_full = os.path.join(self.temp_dir, 'jan_1_31.csv')
-        with open(csv_file_full, 'w') as f:
-            f.write(csv_content_full)
-
-        headers, rows_full = parser.parse_file(csv_file_full)
-
-        generator_full = OFXGenerator()
-        for row in rows_full:
-            generator_full.add_transaction(
-                date=row['date'],
-                amount=parser.normalize_amount(row['amount']),
-                description=row['description']
-            )
-
-        output_full = os.path.join(self.temp_dir, 'jan_1_31.ofx')
-        generator_full.generate(
-            output_path=output_full,
-            account_id='TEST123',
-            bank_name='Test Bank'
-        )
-
-        # Extract FITIDs from full export
-        with open(output_full, 'r') as f:
-            content_full = f.read()
-            fitids_full = re.findall(r'<FITID>(.*?)</FITID>', content_full)
+        fitids_full = _extract_fitids(self._generate(
+            parser, rows_full, DESCRIPTION_COLUMNS,
+            account_id='TEST123', bank_name='Test Bank'
+        ))
 
         # Verify: First 3 FITIDs should match (overlapping transactions)
         self.assertEqual(len(fitids_partial), 3, "Partial export should have 3 transactions")
@@ -466,55 +426,14 @@ class TestIntegration(unittest.TestCase):
 
     def test_deterministic_fitid_with_value_inversion(self):
         """Test deterministic FITID generation when value inversion is enabled."""
-        csv_content = """date,amount,description
-2025-10-01,100.50,Expense
-2025-10-02,50.25,Purchase"""
-
-        csv_file = os.path.join(self.temp_dir, 'test_invert_fitid.csv')
-        with open(csv_file, 'w') as f:
-            f.write(csv_content)
-
-        parser = CSVParser(delimiter=',', decimal_separator='.')
-        headers, rows = parser.parse_file(csv_file)
-
-        # Generate without inversion
-        generator_no_invert = OFXGenerator(invert_values=False)
-        for row in rows:
-            generator_no_invert.add_transaction(
-                date=row['date'],
-                amount=parser.normalize_amount(row['amount']),
-                description=row['description']
-            )
-
-        output_no_invert = os.path.join(self.temp_dir, 'no_invert.ofx')
-        generator_no_invert.generate(
-            output_path=output_no_invert,
-            account_id='TEST123',
-            bank_name='Test Bank'
-        )
-
-        # Generate with inversion
-        generator_invert = OFXGenerator(invert_values=True)
-        for row in rows:
-            generator_invert.add_transaction(
-                date=row['date'],
-                amount=parser.normalize_amount(row['amount']),
-                description=row['description']
-            )
-
-        output_invert = os.path.join(self.temp_dir, 'with_invert.ofx')
-        generator_invert.generate(
-            output_path=output_invert,
-            account_id='TEST123',
-            bank_name='Test Bank'
-        )
-
-        # Extract FITIDs from both files
-        with open(output_no_invert, 'r') as f:
-            fitids_no_invert = re.findall(r'<FITID>(.*?)</FITID>', f.read())
-
-        with open(output_invert, 'r') as f:
-            fitids_invert = re.findall(r'<FITID>(.*?)</FITID>', f.read())
+        fitids_no_invert = _extract_fitids(self._convert(
+            INVERSION_FITID_CSV, DESCRIPTION_COLUMNS, invert_values=False,
+            account_id='TEST123', bank_name='Test Bank'
+        ))
+        fitids_invert = _extract_fitids(self._convert(
+            INVERSION_FITID_CSV, DESCRIPTION_COLUMNS, invert_values=True,
+            account_id='TEST123', bank_name='Test Bank'
+        ))
 
         # FITIDs should be different because inverted amounts are used in FITID calculation
         self.assertEqual(len(fitids_no_invert), 2)
@@ -524,48 +443,6 @@ class TestIntegration(unittest.TestCase):
         self.assertNotEqual(fitids_no_invert[1], fitids_invert[1],
                            "FITIDs should differ when amounts are inverted")
 
-    def test_deterministic_fitid_brazilian_format(self):
-        """Test deterministic FITID generation with Brazilian CSV format."""
-        csv_content = """data;valor;descricao
-01/10/2025;-100,50;Restaurante
-02/10/2025;-50,25;Posto de Gasolina
-03/10/2025;1.000,00;Salário"""
-
-        csv_file = os.path.join(self.temp_dir, 'test_br_fitid.csv')
-        with open(csv_file, 'w', encoding='utf-8') as f:
-            f.write(csv_content)
-
-        parser = CSVParser(delimiter=';', decimal_separator=',')
-        headers, rows = parser.parse_file(csv_file)
-
-        # Generate twice to verify determinism
-        fitids_runs = []
-        for run in range(2):
-            generator = OFXGenerator()
-            for row in rows:
-                generator.add_transaction(
-                    date=row['data'],
-                    amount=parser.normalize_amount(row['valor']),
-                    description=row['descricao']
-                )
-
-            output_file = os.path.join(self.temp_dir, f'output_br_fitid_{run}.ofx')
-            generator.generate(
-                output_path=output_file,
-                account_id='BR123',
-                bank_name='Banco Teste',
-                currency='BRL'
-            )
-
-            with open(output_file, 'r') as f:
-                content = f.read()
-                fitids = re.findall(r'<FITID>(.*?)</FITID>', content)
-                fitids_runs.append(fitids)
-
-        # Verify FITIDs are consistent across runs
-        self.assertEqual(fitids_runs[0], fitids_runs[1],
-                        "Brazilian format should produce deterministic FITIDs")
-
 
 if __name__ == '__main__':
     unittest.main()
@@ -6,25 +6,42 @@ Unit Tests for OFXGenerator
 Test cases for OFX file generation functionality.
 """
 
+import io
+import re
 import unittest
 import os
+import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from src.csv_to_ofx_converter import OFXGenerator
+from src.ofx_generator import _parse_ofx_date
+from src.transaction_utils import generate_deterministic_fitid
+
+# Description longer than the 255-character MEMO limit
+LONG_DESCRIPTION = 'A' * 300
+
+# Body of the <AVAILBAL> aggregate
+_AVAILBAL_RE = re.compile(r'<AVAILBAL>(.*?)</AVAILBAL>', re.S)
 
 
 class TestOFXGenerator(unittest.TestCase):
     """Test cases for OFX Generator."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.generator = OFXGenerator()
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.shared_generator = OFXGenerator()
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test files."""
-        for file in os.listdir(self.temp_dir):
-            os.remove(os.path.join(self.temp_dir, file))
-        os.rmdir(self.temp_dir)
+        shutil.rmtree(cls.temp_dir)
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.generator = self.shared_generator
+        self.generator.reset()
 
     def test_add_transaction(self):
         """Test adding transactions."""
@@ -40,6 +57,28 @@ class TestOFXGenerator(unittest.TestCase):
         self.assertEqual(self.generator.transactions[0]['amount'], -100.50)
         self.assertEqual(self.generator.transactions[0]['memo'], 'Test Purchase')
 
+    def test_reset(self):
+        """Test that reset removes all transactions."""
+        self.generator.add_transaction('2025-10-01', -100, 'Test')
+        self.generator.reset()
+
+        self.assertEqual(self.generator.transactions, [])
+        with self.assertRaises(ValueError):
+            self.generator.generate()
+
+    def test_add_transactions(self):
+        """Test adding several transactions at once."""
+        self.generator.add_transactions([
+            {'date': '2025-10-01', 'amount': -100.50, 'description': 'Purchase'},
+            {'date': '2025-10-02', 'amount': 200.00, 'description': 'Salary',
+             'transaction_type': 'CREDIT'},
+        ])
+
+        self.assertEqual([t['memo'] for t in self.generator.transactions],
+                         ['Purchase', 'Salary'])
+        self.assertEqual([t['type'] for t in self.generator.transactions],
+                         ['DEBIT', 'CREDIT'])
+
     def test_add_credit_transaction(self):
         """Test adding credit transaction."""
         self.generator.add_transaction(
@@ -65,9 +104,21 @@ class TestOFXGenerator(unittest.TestCase):
         ]
 
         for date_str, expected_ofx_date in test_dates:
-            parsed = self.generator._parse_date(date_str)
-            self.assertEqual(parsed, expected_ofx_date,
-                           f"Failed to parse {date_str}")
+            with self.subTest(date=date_str):
+                self.assertEqual(self.generator._parse_date(date_str), expected_ofx_date)
+
+    def test_date_parsing_is_cached(self):
+        """Test that repeated dates are served from the parse cache."""
+        self.generator._parse_date('2025-10-22')
+        hits = _parse_ofx_date.cache_info().hits
+
+        self.assertEqual(self.generator._parse_date('2025-10-22'), '20251022000000[-3:BRT]')
+        self.assertEqual(_parse_ofx_date.cache_info().hits, hits + 1)
+
+    def test_ambiguous_date_prefers_day_first(self):
+        """Test that dates valid as DD/MM and MM/DD are read as DD/MM."""
+        self.assertEqual(self.generator._parse_date('01/02/2025'), '20250201000000[-3:BRT]')
+        self.assertEqual(self.generator._parse_date('02/13/2025'), '20250213000000[-3:BRT]')
 
     def test_invalid_date_format(self):
         """Test handling of invalid date format."""
@@ -109,37 +160,58 @@ class TestOFXGenerator(unittest.TestCase):
         # Verify file was created
         self.assertTrue(os.path.exists(output_file))
 
-        # Read and verify content
-        with open(output_file, 'r') as f:
+        # Read and verify content (raw bytes, no decoding needed)
+        with open(output_file, 'rb') as f:
             content = f.read()
 
-        # Check header
-        self.assertIn('OFXHEADER:100', content)
-        self.assertIn('VERSION:102', content)
-
-        # Check bank info
-        self.assertIn('<ORG>Test Bank</ORG>', content)
-        self.assertIn('<ACCTID>TEST123</ACCTID>', content)
-        self.assertIn('<CURDEF>BRL</CURDEF>', content)
-
-        # Check transactions
-        self.assertIn('<TRNAMT>-100.50</TRNAMT>', content)
-        self.assertIn('<TRNAMT>-50.25</TRNAMT>', content)
-        self.assertIn('<TRNAMT>1000.00</TRNAMT>', content)
-        self.assertIn('<MEMO>Purchase 1</MEMO>', content)
-        self.assertIn('<MEMO>Purchase 2</MEMO>', content)
-        self.assertIn('<MEMO>Salary</MEMO>', content)
-
-        # Check balance
-        expected_balance = -100.50 - 50.25 + 1000.00
-        self.assertIn(f'<BALAMT>{expected_balance:.2f}</BALAMT>', content)
+        # Balance: -100.50 - 50.25 + 1000.00
+        expected_balance = b'<BALAMT>849.25</BALAMT>'
+        for needle in [
+            # Header
+            b'OFXHEADER:100',
+            b'VERSION:102',
+            # Bank info
+            b'<ORG>Test Bank</ORG>',
+            b'<ACCTID>TEST123</ACCTID>',
+            b'<CURDEF>BRL</CURDEF>',
+            # Transactions
+            b'<TRNAMT>-100.50</TRNAMT>',
+            b'<TRNAMT>-50.25</TRNAMT>',
+            b'<TRNAMT>1000.00</TRNAMT>',
+            b'<MEMO>Purchase 1</MEMO>',
+            b'<MEMO>Purchase 2</MEMO>',
+            b'<MEMO>Salary</MEMO>',
+            # Balance
+            expected_balance,
+        ]:
+            self.assertIn(needle, content)
+
+    def test_generate_returns_written_content(self):
+        """Test that generate returns the same content it writes to disk."""
+        self.generator.add_transaction('2025-10-01', -100, 'Test')
+
+        output_file = os.path.join(self.temp_dir, 'returned.ofx')
+        content = self.generator.generate(output_path=output_file, account_id='TEST')
+
+        with open(output_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(content, f.read())
+        self.assertIn('<MEMO>Test</MEMO>', content)
+
+    def test_generate_in_memory(self):
+        """Test that generate without output_path returns content or writes to a stream."""
+        self.generator.add_transaction('2025-10-01', -100, 'Test')
+
+        stream = io.StringIO()
+        content = self.generator.generate(account_id='TEST', output=stream)
+
+        self.assertEqual(stream.getvalue(), content)
+        self.assertEqual(self.generator.generate(account_id='TEST'), content)
+        self.assertIn('<MEMO>Test</MEMO>', content)
 
     def test_generate_without_transactions(self):
         """Test OFX generation without transactions."""
-        output_file = os.path.join(self.temp_dir, 'empty.ofx')
-
         with self.assertRaises(ValueError):
-            self.generator.generate(output_path=output_file)
+            self.generator.generate()
 
     def test_transaction_sorting_by_date(self):
         """Test that transactions are sorted by date."""
@@ -147,8 +219,7 @@ class TestOFXGenerator(unittest.TestCase):
         self.generator.add_transaction('2025-10-01', -200, 'First')
         self.generator.add_transaction('2025-10-02', -150, 'Second')
 
-        output_file = os.path.join(self.temp_dir, 'sorted.ofx')
-        self.generator.generate(output_path=output_file, account_id='TEST')
+        self.generator.generate(account_id='TEST')
 
         # Verify transactions are sorted
         dates = [t['date'] for t in self.generator.transactions]
@@ -183,18 +254,22 @@ class TestOFXGenerator(unittest.TestCase):
         )
 
         # Should have auto-generated UUID
-        trans_id = self.generator.transactions[0]['id']
+        transaction = self.generator.transactions[0]
+        trans_id = transaction['id']
         self.assertIsNotNone(trans_id)
         self.assertEqual(len(trans_id), 36)  # UUID length
 
+        # The ID is the deterministic FITID (no random UUID involved)
+        self.assertEqual(trans_id, generate_deterministic_fitid(
+            transaction['date'], transaction['amount'], transaction['memo']
+        ))
+
     def test_long_description_truncation(self):
         """Test that long descriptions are truncated."""
-        long_description = 'A' * 300  # 300 characters
-
         self.generator.add_transaction(
             date='2025-10-01',
             amount=-100,
-            description=long_description
+            description=LONG_DESCRIPTION
         )
 
         # Should be truncated to 255 characters
@@ -204,21 +279,20 @@ class TestOFXGenerator(unittest.TestCase):
         """Test OFX generation with different currencies."""
         currencies = ['BRL', 'USD', 'EUR', 'GBP']
 
-        for currency in currencies:
+        def generate_for(currency):
             generator = OFXGenerator()
             generator.add_transaction('2025-10-01', -100, 'Test')
+            output = io.StringIO()
+            generator.generate(account_id='TEST', currency=currency, output=output)
+            return output.getvalue()
 
-            output_file = os.path.join(self.temp_dir, f'test_{currency}.ofx')
-            generator.generate(
-                output_path=output_file,
-                account_id='TEST',
-                currency=currency
-            )
-
-            with open(output_file, 'r') as f:
-                content = f.read()
+        # Each currency uses its own generator and stream, so they run concurrently
+        with ThreadPoolExecutor(max_workers=len(currencies)) as executor:
+            contents = executor.map(generate_for, currencies)
 
-            self.assertIn(f'<CURDEF>{currency}</CURDEF>', content)
+            for currency, content in zip(currencies, contents):
+                with self.subTest(currency=currency):
+                    self.assertIn(f'<CURDEF>{currency}</CURDEF>', content)
 
     def test_value_inversion_feature(self):
         """Test value inversion feature (NEW in v2.0)."""
@@ -256,16 +330,11 @@ class TestOFXGenerator(unittest.TestCase):
         generator.add_transaction('2025-10-01', -100, 'Expense', 'DEBIT')
         generator.add_transaction('2025-10-02', 200, 'Income', 'CREDIT')
 
-        output_file = os.path.join(self.temp_dir, 'inverted.ofx')
-        generator.generate(
-            output_path=output_file,
+        content = generator.generate(
             account_id='TEST',
             bank_name='Test Bank'
         )
 
-        with open(output_file, 'r') as f:
-            content = f.read()
-
         # Check inverted amounts
         self.assertIn('<TRNAMT>100.00</TRNAMT>', content)  # Was -100, now 100
         self.assertIn('<TRNAMT>-200.00</TRNAMT>', content)  # Was 200, now -200
@@ -294,17 +363,12 @@ class TestOFXGenerator(unittest.TestCase):
             transaction_type='DEBIT'
         )
 
-        output_file = os.path.join(self.temp_dir, 'initial_balance.ofx')
-        self.generator.generate(
-            output_path=output_file,
+        content = self.generator.generate(
             account_id='TEST',
             bank_name='Test Bank',
             initial_balance=1000.00
         )
 
-        with open(output_file, 'r') as f:
-            content = f.read()
-
         # Check that initial balance appears in AVAILBAL section
         self.assertIn('<AVAILBAL>', content)
         self.assertIn('<BALAMT>1000.00</BALAMT>', content)
@@ -324,20 +388,15 @@ class TestOFXGenerator(unittest.TestCase):
             transaction_type='CREDIT'
         )
 
-        output_file = os.path.join(self.temp_dir, 'auto_balance.ofx')
         initial = 1000.00
         # Expected: 1000 - 100.50 + 500 = 1399.50
-        self.generator.generate(
-            output_path=output_file,
+        content = self.generator.generate(
             account_id='TEST',
             bank_name='Test Bank',
             initial_balance=initial,
             final_balance=None  # Auto-calculate
         )
 
-        with open(output_file, 'r') as f:
-            content = f.read()
-
         # Check calculated final balance in LEDGERBAL
         self.assertIn('<LEDGERBAL>', content)
         # The final balance should be 1399.50
@@ -352,21 +411,17 @@ class TestOFXGenerator(unittest.TestCase):
             transaction_type='DEBIT'
         )
 
-        output_file = os.path.join(self.temp_dir, 'manual_balance.ofx')
         manual_final = 2500.00
-        self.generator.generate(
-            output_path=output_file,
+        expected_balance = '<BALAMT>2500.00</BALAMT>'
+        content = self.generator.generate(
             account_id='TEST',
             bank_name='Test Bank',
             initial_balance=1000.00,
             final_balance=manual_final
         )
 
-        with open(output_file, 'r') as f:
-            content = f.read()
-
         # Check manual final balance appears in output
-        self.assertIn(f'<BALAMT>{manual_final:.2f}</BALAMT>', content)
+        self.assertIn(expected_balance, content)
 
     def test_zero_initial_balance_default(self):
         """Test default initial balance of 0.0 (NEW in v3.0)."""
@@ -377,31 +432,16 @@ class TestOFXGenerator(unittest.TestCase):
             transaction_type='CREDIT'
         )
 
-        output_file = os.path.join(self.temp_dir, 'zero_initial.ofx')
-        self.generator.generate(
-            output_path=output_file,
+        content = self.generator.generate(
             account_id='TEST',
             bank_name='Test Bank'
             # No initial_balance specified, should default to 0.00
         )
 
-        with open(output_file, 'r') as f:
-            content = f.read()
-
         # Should have initial balance of 0.00
-        lines = content.split('\n')
-        availbal_section = []
-        in_availbal = False
-        for line in lines:
-            if '<AVAILBAL>' in line:
-                in_availbal = True
-            if in_availbal:
-                availbal_section.append(line)
-            if '</AVAILBAL>' in line:
-                break
-
-        availbal_text = '\n'.join(availbal_section)
-        self.assertIn('<BALAMT>0.00</BALAMT>', availbal_text)
+        availbal = _AVAILBAL_RE.search(content)
+        self.assertIsNotNone(availbal)
+        self.assertIn('<BALAMT>0.00</BALAMT>', availbal.group(1))
 
     def test_negative_initial_balance(self):
         """Test handling of negative initial balance (NEW in v3.0)."""
@@ -412,17 +452,12 @@ class TestOFXGenerator(unittest.TestCase):
             transaction_type='DEBIT'
         )
 
-        output_file = os.path.join(self.temp_dir, 'negative_initial.ofx')
-        self.generator.generate(
-            output_path=output_file,
+        content = self.generator.generate(
             account_id='TEST',
             bank_name='Test Bank',
             initial_balance=-100.00  # Negative starting balance
         )
 
-        with open(output_file, 'r') as f:
-            content = f.read()
-
         # Should handle negative initial balance
         self.assertIn('<BALAMT>-100.00</BALAMT>', content)
         # Final should be -100 - 50 = -150
@@ -475,14 +510,11 @@ class TestOFXGenerator(unittest.TestCase):
 
     def test_deterministic_fitid_with_long_description(self):
         """Test deterministic FITID with long description (>255 characters)."""
-        # Create a 300-character description
-        long_description = "A" * 300
-
         # Add transaction with long description (no ID)
         self.generator.add_transaction(
             date='2025-10-01',
             amount=-100.50,
-            description=long_description,
+            description=LONG_DESCRIPTION,
             transaction_type='DEBIT'
         )
 
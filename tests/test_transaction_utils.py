@@ -4,23 +4,49 @@ Tests all utility functions for transaction processing without UI dependencies.
 """
 
 import unittest
-import sys
-import os
-
-# Add parent directory to path to import src modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from array import array
+from types import MappingProxyType
 
 from src.transaction_utils import (
     build_transaction_description,
+    make_description_builder,
     determine_transaction_type,
     extract_transaction_id,
     calculate_balance_summary,
+    calculate_balance_summary_from_amounts,
     validate_field_mappings,
     parse_balance_value,
-    generate_deterministic_fitid
+    generate_deterministic_fitid,
+    _normalize_fitid_date
 )
 from src.constants import NOT_MAPPED, NOT_SELECTED
 
+# Read-only row shared by description tests; the builder only reads rows
+_DESCRIPTION_ROW = MappingProxyType({
+    'date': '2025-01-01',
+    'memo': 'Purchase',
+    'vendor': 'Store A',
+    'category': 'Food',
+    'amount': '100.00'
+})
+_DESCRIPTION_COLUMNS = ('memo', 'vendor', 'category')
+
+# Shared FITID inputs; each case overrides only the field it varies
+_FITID_BASE = dict(date="20260115", amount=-100.50, memo="Purchase")
+
+# Known FITIDs for _FITID_BASE variants; these must never change, since
+# reconciliation in finance apps depends on stable IDs across versions
+_FITID_PURCHASE = 'e28792e1-a2ed-5034-97d2-1849570ecc73'
+_FITID_RESTAURANT_PURCHASE = '58cdb35c-ce41-5bcf-bb50-05ee37aefa47'
+_FITID_PURCHASE_ACC001 = 'd4a43d99-2223-5119-aa5d-c20359c89304'
+_FITID_PURCHASE_DISAMBIGUATED = 'c38e7f3d-c477-5b67-9e37-ab9734c22766'
+_FITID_MEMO_255A = 'd42dfc58-590d-55c3-866f-d3cac561998e'  # memo=_MEMO_255A
+
+# Memos around the 255-character truncation limit
+_MEMO_255A = "a" * 255
+_MEMO_256AB = "a" * 254 + "b" + "a"  # 256 chars, differs at position 254
+_MEMO_300A = "a" * 300
+
 
 class TestBuildTransactionDescription(unittest.TestCase):
     """Test cases for build_transaction_description function."""
@@ -37,114 +63,42 @@ class TestBuildTransactionDescription(unittest.TestCase):
         )
         self.assertEqual(result, 'Purchase at store')
 
-    def test_composite_description_two_columns(self):
-        """Test building composite description from two columns."""
-        row = {'memo': 'Purchase', 'vendor': 'Store A', 'amount': '100.00'}
-        result = build_transaction_description(
-            row=row,
-            desc_col='memo',
-            description_columns=['memo', 'vendor'],
-            separator=' - ',
-            use_composite=True
-        )
-        self.assertEqual(result, 'Purchase - Store A')
-
-    def test_composite_description_multiple_columns(self):
-        """Test building composite description from multiple columns."""
-        row = {
-            'date': '2025-01-01',
-            'memo': 'Purchase',
-            'vendor': 'Store A',
-            'category': 'Food',
-            'amount': '100.00'
-        }
-        result = build_transaction_description(
-            row=row,
-            desc_col='memo',
-            description_columns=['memo', 'vendor', 'category'],
-            separator=' | ',
-            use_composite=True
-        )
-        self.assertEqual(result, 'Purchase | Store A | Food')
-
-    def test_composite_description_with_not_selected(self):
-        """Test composite description skips NOT_SELECTED columns."""
-        row = {'memo': 'Purchase', 'vendor': 'Store A', 'category': 'Food'}
-        result = build_transaction_description(
-            row=row,
-            desc_col='memo',
-            description_columns=[NOT_SELECTED, 'memo', 'vendor'],
-            separator=' - ',
-            use_composite=True
-        )
-        self.assertEqual(result, 'Purchase - Store A')
-
-    def test_composite_description_missing_columns(self):
-        """Test composite description handles missing columns."""
-        row = {'memo': 'Purchase', 'amount': '100.00'}
-        result = build_transaction_description(
-            row=row,
-            desc_col='memo',
-            description_columns=['memo', 'vendor', 'category'],
-            separator=' - ',
-            use_composite=True
-        )
-        self.assertEqual(result, 'Purchase')
-
-    def test_composite_description_empty_values(self):
-        """Test composite description skips empty values."""
-        row = {'memo': 'Purchase', 'vendor': '', 'category': 'Food'}
-        result = build_transaction_description(
-            row=row,
-            desc_col='memo',
-            description_columns=['memo', 'vendor', 'category'],
-            separator=' - ',
-            use_composite=True
-        )
-        self.assertEqual(result, 'Purchase - Food')
-
-    def test_composite_description_whitespace_values(self):
-        """Test composite description skips whitespace-only values."""
-        row = {'memo': 'Purchase', 'vendor': '   ', 'category': 'Food'}
-        result = build_transaction_description(
-            row=row,
-            desc_col='memo',
-            description_columns=['memo', 'vendor', 'category'],
-            separator=' - ',
-            use_composite=True
-        )
-        self.assertEqual(result, 'Purchase - Food')
-
-    def test_composite_description_all_empty(self):
-        """Test composite description returns 'Transaction' when all values empty."""
-        row = {'memo': '', 'vendor': '', 'category': ''}
-        result = build_transaction_description(
-            row=row,
-            desc_col='memo',
-            description_columns=['memo', 'vendor', 'category'],
-            separator=' - ',
-            use_composite=True
-        )
-        self.assertEqual(result, 'Transaction')
-
-    def test_composite_description_different_separators(self):
-        """Test composite description with different separators."""
-        row = {'memo': 'Purchase', 'vendor': 'Store A'}
-
-        # Space separator
-        result = build_transaction_description(
-            row, 'memo', ['memo', 'vendor'], ' ', True)
-        self.assertEqual(result, 'Purchase Store A')
-
-        # Comma separator
-        result = build_transaction_description(
-            row, 'memo', ['memo', 'vendor'], ', ', True)
-        self.assertEqual(result, 'Purchase, Store A')
+    def test_composite_description_cases(self):
+        """Test composite descriptions across column selections and separators."""
+        row = _DESCRIPTION_ROW
+        # (case, row, description_columns, separator, expected)
+        cases = [
+            ('two columns', row, ['memo', 'vendor'], ' - ', 'Purchase - Store A'),
+            ('multiple columns', row, _DESCRIPTION_COLUMNS, ' | ',
+             'Purchase | Store A | Food'),
+            ('skips NOT_SELECTED', row, [NOT_SELECTED, 'memo', 'vendor'], ' - ',
+             'Purchase - Store A'),
+            ('missing columns', {'memo': 'Purchase', 'amount': '100.00'},
+             _DESCRIPTION_COLUMNS, ' - ', 'Purchase'),
+            ('empty values', {'memo': 'Purchase', 'vendor': '', 'category': 'Food'},
+             _DESCRIPTION_COLUMNS, ' - ', 'Purchase - Food'),
+            ('whitespace values', {'memo': 'Purchase', 'vendor': '   ', 'category': 'Food'},
+             _DESCRIPTION_COLUMNS, ' - ', 'Purchase - Food'),
+            ('all empty', {'memo': '', 'vendor': '', 'category': ''},
+             _DESCRIPTION_COLUMNS, ' - ', 'Transaction'),
+            ('space separator', row, ['memo', 'vendor'], ' ', 'Purchase Store A'),
+            ('comma separator', row, ['memo', 'vendor'], ', ', 'Purchase, Store A'),
+            ('pipe separator', row, ['memo', 'vendor'], ' | ', 'Purchase | Store A'),
+            ('single-character separator', row, ['memo', 'vendor'], '/', 'Purchase/Store A'),
+        ]
 
-        # Pipe separator
-        result = build_transaction_description(
-            row, 'memo', ['memo', 'vendor'], ' | ', True)
-        self.assertEqual(result, 'Purchase | Store A')
+        for case, case_row, columns, separator, expected in cases:
+            with self.subTest(case=case):
+                result = build_transaction_description(
+                    row=case_row,
+                    desc_col='memo',
+                    description_columns=columns,
+                    separator=separator,
+                    use_composite=True
+                )
+                self.assertEqual(result, expected)
+                build = make_description_builder('memo', columns, separator, True)
+                self.assertEqual(build(case_row), expected)
 
     def test_single_column_missing(self):
         """Test single column description when column is missing."""
@@ -158,139 +112,79 @@ class TestBuildTransactionDescription(unittest.TestCase):
         )
         self.assertEqual(result, 'Transaction')
 
+    def test_description_builder_reused_across_rows(self):
+        """Test one specialized builder gives per-row results."""
+        build = make_description_builder('memo', ['memo', 'vendor'], ' - ', True)
+        self.assertEqual(build({'memo': 'Purchase', 'vendor': 'Store A'}), 'Purchase - Store A')
+        self.assertEqual(build({'memo': ' Refund ', 'vendor': ''}), 'Refund')
+        self.assertEqual(build({}), 'Transaction')
+
+        build = make_description_builder('memo', ['memo', 'vendor'], ' - ', False)
+        self.assertEqual(build({'memo': 'Purchase', 'vendor': 'Store A'}), 'Purchase')
+        self.assertEqual(build({'vendor': 'Store A'}), 'Transaction')
+
 
 class TestDetermineTransactionType(unittest.TestCase):
     """Test cases for determine_transaction_type function."""
 
-    def test_type_column_valid_debit(self):
-        """Test type determination when column has valid DEBIT value."""
-        result = determine_transaction_type(
-            type_col='type',
-            row={'type': 'DEBIT', 'amount': '100.00'},
-            amount=100.0
-        )
-        self.assertEqual(result, 'DEBIT')
-
-    def test_type_column_valid_credit(self):
-        """Test type determination when column has valid CREDIT value."""
-        result = determine_transaction_type(
-            type_col='type',
-            row={'type': 'CREDIT', 'amount': '100.00'},
-            amount=-100.0
-        )
-        self.assertEqual(result, 'CREDIT')
-
-    def test_type_column_lowercase(self):
-        """Test type determination handles lowercase values."""
-        result = determine_transaction_type(
-            type_col='type',
-            row={'type': 'debit'},
-            amount=100.0
-        )
-        self.assertEqual(result, 'DEBIT')
-
-    def test_type_column_invalid_infers_from_negative_amount(self):
-        """Test type inferred from amount when column has invalid value."""
-        result = determine_transaction_type(
-            type_col='type',
-            row={'type': 'INVALID'},
-            amount=-50.0
-        )
-        self.assertEqual(result, 'DEBIT')
-
-    def test_type_column_invalid_infers_from_positive_amount(self):
-        """Test type inferred from amount when column has invalid value."""
-        result = determine_transaction_type(
-            type_col='type',
-            row={'type': 'INVALID'},
-            amount=50.0
-        )
-        self.assertEqual(result, 'CREDIT')
-
-    def test_type_column_not_mapped_negative_amount(self):
-        """Test type inferred from negative amount when column not mapped."""
-        result = determine_transaction_type(
-            type_col=NOT_MAPPED,
-            row={},
-            amount=-100.0
-        )
-        self.assertEqual(result, 'DEBIT')
-
-    def test_type_column_not_mapped_positive_amount(self):
-        """Test type inferred from positive amount when column not mapped."""
-        result = determine_transaction_type(
-            type_col=NOT_MAPPED,
-            row={},
-            amount=100.0
-        )
-        self.assertEqual(result, 'CREDIT')
-
-    def test_type_column_not_mapped_zero_amount(self):
-        """Test type for zero amount (should be CREDIT as >= 0)."""
-        result = determine_transaction_type(
-            type_col=NOT_MAPPED,
-            row={},
-            amount=0.0
-        )
-        self.assertEqual(result, 'CREDIT')
-
-    def test_type_column_missing_from_row(self):
-        """Test type determination when column is not in row."""
-        result = determine_transaction_type(
-            type_col='type',
-            row={'amount': '100.00'},
-            amount=-50.0
-        )
-        self.assertEqual(result, 'DEBIT')
+    def test_determine_type_cases(self):
+        """Test type determination from the type column or the amount sign."""
+        # (case, type_col, row, amount, expected)
+        cases = [
+            ('valid DEBIT', 'type', {'type': 'DEBIT', 'amount': '100.00'}, 100.0, 'DEBIT'),
+            ('valid CREDIT', 'type', {'type': 'CREDIT', 'amount': '100.00'}, -100.0, 'CREDIT'),
+            ('lowercase value', 'type', {'type': 'debit'}, 100.0, 'DEBIT'),
+            ('invalid value, negative amount', 'type', {'type': 'INVALID'}, -50.0, 'DEBIT'),
+            ('invalid value, positive amount', 'type', {'type': 'INVALID'}, 50.0, 'CREDIT'),
+            ('not mapped, negative amount', NOT_MAPPED, {}, -100.0, 'DEBIT'),
+            ('not mapped, positive amount', NOT_MAPPED, {}, 100.0, 'CREDIT'),
+            # Zero counts as CREDIT (amount >= 0)
+            ('not mapped, zero amount', NOT_MAPPED, {}, 0.0, 'CREDIT'),
+            ('column missing from row', 'type', {'amount': '100.00'}, -50.0, 'DEBIT'),
+        ]
+
+        for case, type_col, row, amount, expected in cases:
+            with self.subTest(case=case):
+                result = determine_transaction_type(
+                    type_col=type_col,
+                    row=row,
+                    amount=amount
+                )
+                self.assertEqual(result, expected)
 
 
 class TestExtractTransactionId(unittest.TestCase):
     """Test cases for extract_transaction_id function."""
 
-    def test_id_column_mapped_and_present(self):
-        """Test extracting ID when column is mapped and present."""
-        result = extract_transaction_id(
-            id_col='trans_id',
-            row={'trans_id': 'TXN123', 'amount': '100.00'}
-        )
-        self.assertEqual(result, 'TXN123')
-
-    def test_id_column_mapped_but_missing(self):
-        """Test extracting ID when column is mapped but not in row."""
-        result = extract_transaction_id(
-            id_col='trans_id',
-            row={'amount': '100.00'}
-        )
-        self.assertIsNone(result)
-
-    def test_id_column_not_mapped(self):
-        """Test extracting ID when column is not mapped."""
-        result = extract_transaction_id(
-            id_col=NOT_MAPPED,
-            row={'trans_id': 'TXN123', 'amount': '100.00'}
-        )
-        self.assertIsNone(result)
-
-    def test_id_column_empty_value(self):
-        """Test extracting ID when value is empty string."""
-        result = extract_transaction_id(
-            id_col='trans_id',
-            row={'trans_id': '', 'amount': '100.00'}
-        )
-        self.assertEqual(result, '')
+    def test_extract_id_cases(self):
+        """Test extracting the ID for mapped, unmapped and missing columns."""
+        # (case, id_col, row, expected)
+        cases = [
+            ('mapped and present', 'trans_id', {'trans_id': 'TXN123', 'amount': '100.00'},
+             'TXN123'),
+            ('mapped but missing', 'trans_id', {'amount': '100.00'}, None),
+            ('not mapped', NOT_MAPPED, {'trans_id': 'TXN123', 'amount': '100.00'}, None),
+            ('empty value', 'trans_id', {'trans_id': '', 'amount': '100.00'}, ''),
+            ('numeric value', 'trans_id', {'trans_id': '12345'}, '12345'),
+        ]
 
-    def test_id_column_numeric_value(self):
-        """Test extracting numeric ID value."""
-        result = extract_transaction_id(
-            id_col='trans_id',
-            row={'trans_id': '12345'}
-        )
-        self.assertEqual(result, '12345')
+        for case, id_col, row, expected in cases:
+            with self.subTest(case=case):
+                self.assertEqual(extract_transaction_id(id_col=id_col, row=row), expected)
 
 
 class TestCalculateBalanceSummary(unittest.TestCase):
     """Test cases for calculate_balance_summary function."""
 
+    def _assert_summary(self, transactions, initial_balance, expected):
+        """Check the expected keys, for dict rows and for an array('d') of amounts."""
+        result = calculate_balance_summary(transactions, initial_balance)
+        for key, value in expected.items():
+            self.assertEqual(result[key], value, key)
+
+        amounts = array('d', [trans.get('amount', 0.0) for trans in transactions])
+        self.assertEqual(calculate_balance_summary_from_amounts(amounts, initial_balance), result)
+
     def test_balance_with_credits_and_debits(self):
         """Test balance calculation with both credits and debits."""
         transactions = [
@@ -299,13 +193,13 @@ class TestCalculateBalanceSummary(unittest.TestCase):
             {'amount': 25.0},
             {'amount': -10.0}
         ]
-        result = calculate_balance_summary(transactions, 1000.0)
-
-        self.assertEqual(result['initial_balance'], 1000.0)
-        self.assertEqual(result['total_credits'], 125.0)
-        self.assertEqual(result['total_debits'], 60.0)
-        self.assertEqual(result['calculated_final_balance'], 1065.0)
-        self.assertEqual(result['transaction_count'], 4)
+        self._assert_summary(transactions, 1000.0, {
+            'initial_balance': 1000.0,
+            'total_credits': 125.0,
+            'total_debits': 60.0,
+            'calculated_final_balance': 1065.0,
+            'transaction_count': 4
+        })
 
     def test_balance_only_credits(self):
         """Test balance calculation with only credit transactions."""
@@ -314,11 +208,11 @@ class TestCalculateBalanceSummary(unittest.TestCase):
             {'amount': 50.0},
             {'amount': 25.0}
         ]
-        result = calculate_balance_summary(transactions, 500.0)
-
-        self.assertEqual(result['total_credits'], 175.0)
-        self.assertEqual(result['total_debits'], 0.0)
-        self.assertEqual(result['calculated_final_balance'], 675.0)
+        self._assert_summary(transactions, 500.0, {
+            'total_credits': 175.0,
+            'total_debits': 0.0,
+            'calculated_final_balance': 675.0
+        })
 
     def test_balance_only_debits(self):
         """Test balance calculation with only debit transactions."""
@@ -327,21 +221,21 @@ class TestCalculateBalanceSummary(unittest.TestCase):
             {'amount': -50.0},
             {'amount': -25.0}
         ]
-        result = calculate_balance_summary(transactions, 500.0)
-
-        self.assertEqual(result['total_credits'], 0.0)
-        self.assertEqual(result['total_debits'], 175.0)
-        self.assertEqual(result['calculated_final_balance'], 325.0)
+        self._assert_summary(transactions, 500.0, {
+            'total_credits': 0.0,
+            'total_debits': 175.0,
+            'calculated_final_balance': 325.0
+        })
 
     def test_balance_empty_transactions(self):
         """Test balance calculation with no transactions."""
-        result = calculate_balance_summary([], 1000.0)
-
-        self.assertEqual(result['initial_balance'], 1000.0)
-        self.assertEqual(result['total_credits'], 0.0)
-        self.assertEqual(result['total_debits'], 0.0)
-        self.assertEqual(result['calculated_final_balance'], 1000.0)
-        self.assertEqual(result['transaction_count'], 0)
+        self._assert_summary([], 1000.0, {
+            'initial_balance': 1000.0,
+            'total_credits': 0.0,
+            'total_debits': 0.0,
+            'calculated_final_balance': 1000.0,
+            'transaction_count': 0
+        })
 
     def test_balance_zero_initial(self):
         """Test balance calculation with zero initial balance."""
@@ -349,18 +243,14 @@ class TestCalculateBalanceSummary(unittest.TestCase):
             {'amount': 100.0},
             {'amount': -50.0}
         ]
-        result = calculate_balance_summary(transactions, 0.0)
-
-        self.assertEqual(result['calculated_final_balance'], 50.0)
+        self._assert_summary(transactions, 0.0, {'calculated_final_balance': 50.0})
 
     def test_balance_negative_initial(self):
         """Test balance calculation with negative initial balance."""
         transactions = [
             {'amount': 100.0}
         ]
-        result = calculate_balance_summary(transactions, -50.0)
-
-        self.assertEqual(result['calculated_final_balance'], 50.0)
+        self._assert_summary(transactions, -50.0, {'calculated_final_balance': 50.0})
 
     def test_balance_zero_amounts(self):
         """Test balance calculation with zero amount transactions."""
@@ -368,11 +258,11 @@ class TestCalculateBalanceSummary(unittest.TestCase):
             {'amount': 0.0},
             {'amount': 0.0}
         ]
-        result = calculate_balance_summary(transactions, 1000.0)
-
-        self.assertEqual(result['total_credits'], 0.0)
-        self.assertEqual(result['total_debits'], 0.0)
-        self.assertEqual(result['calculated_final_balance'], 1000.0)
+        self._assert_summary(transactions, 1000.0, {
+            'total_credits': 0.0,
+            'total_debits': 0.0,
+            'calculated_final_balance': 1000.0
+        })
 
     def test_balance_missing_amount_key(self):
         """Test balance calculation handles missing amount key."""
@@ -381,12 +271,64 @@ class TestCalculateBalanceSummary(unittest.TestCase):
             {'description': 'No amount'},
             {'amount': -50.0}
         ]
-        result = calculate_balance_summary(transactions, 1000.0)
-
         # Missing amount treated as 0.0
-        self.assertEqual(result['calculated_final_balance'], 1050.0)
+        self._assert_summary(transactions, 1000.0, {
+            'calculated_final_balance': 1050.0,
+            'transaction_count': 3
+        })
+
+    def test_balance_large_statement(self):
+        """Test balance totals over large synthetic statements."""
+        for count in (1000, 10000):
+            with self.subTest(count=count):
+                # Alternating +1.25 / -0.75 rows
+                transactions = [{'amount': 1.25 if i % 2 == 0 else -0.75} for i in range(count)]
+                result = calculate_balance_summary(transactions, 100.0)
+
+                self.assertAlmostEqual(result['total_credits'], 1.25 * count / 2)
+                self.assertAlmostEqual(result['total_debits'], 0.75 * count / 2)
+                self.assertAlmostEqual(result['calculated_final_balance'], 100.0 + 0.25 * count)
+                self.assertEqual(result['transaction_count'], count)
+
+
+class TestCalculateBalanceSummaryFromAmounts(unittest.TestCase):
+    """Test cases for calculate_balance_summary_from_amounts function."""
+
+    def test_from_list(self):
+        """Test summary from a plain list of amounts."""
+        result = calculate_balance_summary_from_amounts([100.0, -50.0, 25.0, -10.0], 1000.0)
+
+        self.assertEqual(result['total_credits'], 125.0)
+        self.assertEqual(result['total_debits'], 60.0)
+        self.assertEqual(result['calculated_final_balance'], 1065.0)
+        self.assertEqual(result['transaction_count'], 4)
+
+    def test_from_array(self):
+        """Test summary from an array('d') of amounts."""
+        result = calculate_balance_summary_from_amounts(array('d', [-100.0, -50.0, 0.0]), 500.0)
+
+        self.assertEqual(result['total_credits'], 0.0)
+        self.assertEqual(result['total_debits'], 150.0)
+        self.assertEqual(result['calculated_final_balance'], 350.0)
         self.assertEqual(result['transaction_count'], 3)
 
+    def test_empty(self):
+        """Test summary with no amounts."""
+        result = calculate_balance_summary_from_amounts(array('d'), 1000.0)
+
+        self.assertEqual(result['calculated_final_balance'], 1000.0)
+        self.assertEqual(result['transaction_count'], 0)
+
+    def test_matches_dict_version(self):
+        """Test results are identical to calculate_balance_summary."""
+        amounts = [1.25 if i % 3 else -0.1 * i for i in range(1000)]
+        transactions = [{'amount': amount} for amount in amounts]
+
+        self.assertEqual(
+            calculate_balance_summary_from_amounts(array('d', amounts), 42.0),
+            calculate_balance_summary(transactions, 42.0)
+        )
+
 
 class TestValidateFieldMappings(unittest.TestCase):
     """Test cases for validate_field_mappings function."""
@@ -466,359 +408,148 @@ class TestValidateFieldMappings(unittest.TestCase):
 class TestParseBalanceValue(unittest.TestCase):
     """Test cases for parse_balance_value function."""
 
-    def test_parse_valid_positive_number(self):
-        """Test parsing valid positive number string."""
-        result = parse_balance_value('1000.50')
-        self.assertEqual(result, 1000.5)
-
-    def test_parse_valid_negative_number(self):
-        """Test parsing valid negative number string."""
-        result = parse_balance_value('-500.25')
-        self.assertEqual(result, -500.25)
-
-    def test_parse_zero(self):
-        """Test parsing zero."""
-        result = parse_balance_value('0')
-        self.assertEqual(result, 0.0)
-
-    def test_parse_with_whitespace(self):
-        """Test parsing number with leading/trailing whitespace."""
-        result = parse_balance_value('  1000.50  ')
-        self.assertEqual(result, 1000.5)
-
-    def test_parse_empty_string_uses_default(self):
-        """Test parsing empty string returns default."""
-        result = parse_balance_value('')
-        self.assertEqual(result, 0.0)
-
-    def test_parse_empty_string_custom_default(self):
-        """Test parsing empty string with custom default."""
-        result = parse_balance_value('', default=100.0)
-        self.assertEqual(result, 100.0)
-
-    def test_parse_whitespace_only_uses_default(self):
-        """Test parsing whitespace-only string returns default."""
-        result = parse_balance_value('   ')
-        self.assertEqual(result, 0.0)
-
-    def test_parse_invalid_string_uses_default(self):
-        """Test parsing invalid string returns default."""
-        result = parse_balance_value('invalid')
-        self.assertEqual(result, 0.0)
-
-    def test_parse_invalid_string_custom_default(self):
-        """Test parsing invalid string with custom default."""
-        result = parse_balance_value('abc123', default=250.0)
-        self.assertEqual(result, 250.0)
-
-    def test_parse_none_value_uses_default(self):
-        """Test parsing None value returns default."""
-        result = parse_balance_value(None, default=50.0)
-        self.assertEqual(result, 50.0)
-
-    def test_parse_scientific_notation(self):
-        """Test parsing scientific notation."""
-        result = parse_balance_value('1.5e3')
-        self.assertEqual(result, 1500.0)
-
-    def test_parse_integer_string(self):
-        """Test parsing integer string."""
-        result = parse_balance_value('1000')
-        self.assertEqual(result, 1000.0)
+    def test_parse_balance_cases(self):
+        """Test parsing balance strings, falling back to the default when invalid."""
+        # (case, value, default, expected)
+        cases = [
+            ('positive number', '1000.50', 0.0, 1000.5),
+            ('negative number', '-500.25', 0.0, -500.25),
+            ('zero', '0', 0.0, 0.0),
+            ('surrounding whitespace', '  1000.50  ', 0.0, 1000.5),
+            ('scientific notation', '1.5e3', 0.0, 1500.0),
+            ('integer string', '1000', 0.0, 1000.0),
+            ('empty string', '', 0.0, 0.0),
+            ('empty string, custom default', '', 100.0, 100.0),
+            ('whitespace only', '   ', 0.0, 0.0),
+            ('invalid string', 'invalid', 0.0, 0.0),
+            ('invalid string, custom default', 'abc123', 250.0, 250.0),
+            ('None', None, 50.0, 50.0),
+            ('nan', 'nan', 10.0, 10.0),
+            ('infinity', '-inf', 10.0, 10.0),
+            ('leading sign and dot', '+.5', 0.0, 0.5),
+            ('underscore digit grouping', '1_000.5', 0.0, 1000.5),
+            ('misplaced underscore', '1__000', 7.0, 7.0),
+        ]
+
+        for case, value, default, expected in cases:
+            with self.subTest(case=case):
+                self.assertEqual(parse_balance_value(value, default=default), expected)
 
 
 class TestGenerateDeterministicFitid(unittest.TestCase):
     """Test cases for generate_deterministic_fitid function."""
 
-    def test_generate_deterministic_fitid_basic(self):
-        """Test basic deterministic FITID generation."""
-        fitid = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Restaurant Purchase"
-        )
-
-        # Verify valid UUID format
-        self.assertIsInstance(fitid, str)
-        self.assertEqual(len(fitid), 36)  # UUID format: 8-4-4-4-12
-        self.assertIn('-', fitid)
-        # Verify UUID v5 format (version 5, variant 1)
-        parts = fitid.split('-')
-        self.assertEqual(len(parts), 5)
-
-    def test_generate_deterministic_fitid_deterministic(self):
-        """Test that same inputs always produce same output."""
-        # Generate FITID twice with identical inputs
-        fitid1 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Restaurant Purchase"
-        )
-        fitid2 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Restaurant Purchase"
-        )
-
-        # Must be identical
-        self.assertEqual(fitid1, fitid2)
-
-    def test_generate_deterministic_fitid_different_dates(self):
-        """Test that different dates produce different IDs."""
-        fitid1 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase"
-        )
-        fitid2 = generate_deterministic_fitid(
-            date="20260116",
-            amount=-100.50,
-            memo="Purchase"
-        )
-
-        # Different dates should produce different IDs
-        self.assertNotEqual(fitid1, fitid2)
-
-    def test_generate_deterministic_fitid_different_amounts(self):
-        """Test that different amounts produce different IDs."""
-        fitid1 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase"
-        )
-        fitid2 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-200.50,
-            memo="Purchase"
-        )
-
-        # Different amounts should produce different IDs
-        self.assertNotEqual(fitid1, fitid2)
-
-    def test_generate_deterministic_fitid_different_memos(self):
-        """Test that different memos produce different IDs."""
-        fitid1 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Restaurant"
-        )
-        fitid2 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Store"
-        )
-
-        # Different memos should produce different IDs
-        self.assertNotEqual(fitid1, fitid2)
-
-    def test_generate_deterministic_fitid_ofx_date_normalization(self):
-        """Test that OFX format dates are normalized correctly."""
-        # Pass OFX format date
-        fitid1 = generate_deterministic_fitid(
-            date="20260115000000[-3:BRT]",
-            amount=-100.50,
-            memo="Purchase"
-        )
-
-        # Pass simple date format
-        fitid2 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase"
-        )
-
-        # Must be identical (date normalization works)
-        self.assertEqual(fitid1, fitid2)
-
-    def test_generate_deterministic_fitid_amount_normalization(self):
-        """Test that amounts are normalized to 2 decimal places."""
-        # Same amount with different decimal places
-        fitid1 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase"
-        )
-        fitid2 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.55,
-            memo="Purchase"
-        )
-        fitid3 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.5,
-            memo="Purchase"
-        )
+    # (date, amount, memo)
+    _EXTREME_CASES = (
+        ("20260115", 999999999.99, "Large transaction"),
+        ("20260115", 0.01, "Small transaction"),
+        ("20260115", 0.00, "Zero transaction"),
+        ("20260115", -999999999.99, "Large negative"),
+    )
+    # OFX datetime with timezone, OFX datetime, and date-only forms
+    _DATE_FORMAT_CASES = (
+        ("20260115000000[-3:BRT]", -100.50, "Purchase"),
+        ("20260115000000", -100.50, "Purchase"),
+        ("20260115", -100.50, "Purchase"),
+    )
+
+    def test_generate_deterministic_fitid_shape(self):
+        """Test FITIDs are UUID-formatted strings for varied inputs."""
+        cases = [
+            ('basic', dict(memo="Restaurant Purchase")),
+            ('positive amount', dict(amount=100.50, memo="Deposit")),
+            ('zero amount', dict(amount=0.0, memo="Adjustment")),
+            ('large amount', dict(amount=-999999.99, memo="Large payment")),
+            ('empty memo', dict(memo="")),
+            ('empty account and disambiguation',
+             dict(memo="Purchase", account_id="", disambiguation="")),
+        ]
 
-        # fitid1 and fitid2 should differ (different amounts)
-        self.assertNotEqual(fitid1, fitid2)
-        # fitid1 and fitid3 should be same (normalized to -100.50)
-        self.assertEqual(fitid1, fitid3)
+        for case, overrides in cases:
+            with self.subTest(case=case):
+                fitid = generate_deterministic_fitid(**dict(_FITID_BASE, **overrides))
+
+                # UUID format: 8-4-4-4-12
+                self.assertIsInstance(fitid, str)
+                self.assertEqual(len(fitid), 36)
+                self.assertEqual(len(fitid.split('-')), 5)
+
+    def test_generate_deterministic_fitid_equivalent_inputs(self):
+        """Test inputs that normalize to the same key produce the known ID."""
+        # (case, overrides, expected FITID)
+        cases = [
+            ('baseline', {}, _FITID_PURCHASE),
+            ('deterministic', dict(memo="Restaurant Purchase"), _FITID_RESTAURANT_PURCHASE),
+            ('OFX date normalization', dict(date="20260115000000[-3:BRT]"), _FITID_PURCHASE),
+            ('amount normalized to 2 decimals', dict(amount=-100.5), _FITID_PURCHASE),
+            ('amount rounded down to cents', dict(amount=-100.504), _FITID_PURCHASE),
+            ('amount rounded up to cents', dict(amount=-100.496), _FITID_PURCHASE),
+            ('memo whitespace stripped', dict(memo="  Purchase  "), _FITID_PURCHASE),
+            ('memo lowercased', dict(memo="PURCHASE"), _FITID_PURCHASE),
+            ('account_id', dict(account_id="ACC001"), _FITID_PURCHASE_ACC001),
+            ('disambiguation', dict(disambiguation="1"), _FITID_PURCHASE_DISAMBIGUATED),
+        ]
 
-    def test_generate_deterministic_fitid_memo_normalization(self):
-        """Test that memos are normalized (stripped, lowercase)."""
-        # Memo with whitespace and mixed case
-        fitid1 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="  Purchase  "
-        )
-        fitid2 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="PURCHASE"
-        )
-        fitid3 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="purchase"
-        )
+        for case, overrides, expected in cases:
+            with self.subTest(case=case):
+                self.assertEqual(
+                    generate_deterministic_fitid(**dict(_FITID_BASE, **overrides)),
+                    expected
+                )
+
+    def test_generate_deterministic_fitid_distinct_inputs(self):
+        """Test that changing any key field produces a different ID."""
+        cases = [
+            ('different dates', dict(date="20260116")),
+            ('different amounts', dict(amount=-200.50)),
+            ('different cents', dict(amount=-100.55)),
+            ('different memos', dict(memo="Store")),
+            ('account_id added', dict(account_id="ACC001")),
+            ('disambiguation added', dict(disambiguation="1")),
+        ]
 
-        # All should be identical (normalized to "purchase")
-        self.assertEqual(fitid1, fitid2)
-        self.assertEqual(fitid2, fitid3)
+        for case, overrides in cases:
+            with self.subTest(case=case):
+                self.assertNotEqual(
+                    generate_deterministic_fitid(**dict(_FITID_BASE, **overrides)),
+                    _FITID_PURCHASE
+                )
 
     def test_generate_deterministic_fitid_memo_truncation(self):
         """Test that memos longer than 255 characters are truncated."""
-        # Memo exactly 255 characters with 'a'
-        memo_255_a = "a" * 255
-        # Memo with 256 characters but different at position 254 (to show truncation effect)
-        memo_256_ab = "a" * 254 + "b" + "a"  # 256 chars, differs at position 254
-        # Memo with 300 characters
-        memo_300_a = "a" * 300
-
-        fitid_255_a = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo=memo_255_a
-        )
-        fitid_256_ab = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo=memo_256_ab
-        )
-        fitid_300_a = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo=memo_300_a
-        )
-
-        # fitid_255_a and fitid_256_ab should differ (difference at position 254)
-        self.assertNotEqual(fitid_255_a, fitid_256_ab)
-        # fitid_300_a should be identical to fitid_255_a (all truncated to 255 a's)
-        self.assertEqual(fitid_255_a, fitid_300_a)
-
-    def test_generate_deterministic_fitid_with_account_id(self):
-        """Test that different account_ids produce different IDs."""
-        # Without account_id
-        fitid1 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase"
-        )
-
-        # With account_id
-        fitid2 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase",
-            account_id="ACC001"
-        )
-
-        # Different account_ids should produce different IDs
-        self.assertNotEqual(fitid1, fitid2)
-
-        # Same account_id should produce same ID
-        fitid3 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase",
-            account_id="ACC001"
-        )
-        self.assertEqual(fitid2, fitid3)
-
-    def test_generate_deterministic_fitid_with_disambiguation(self):
-        """Test that different disambiguation values produce different IDs."""
-        # Without disambiguation
-        fitid1 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase"
+        self.assertEqual(
+            generate_deterministic_fitid(date="20260115", amount=-100.50, memo=_MEMO_255A),
+            _FITID_MEMO_255A
         )
-
-        # With disambiguation
-        fitid2 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase",
-            disambiguation="1"
+        # A difference inside the first 255 characters changes the ID
+        self.assertNotEqual(
+            generate_deterministic_fitid(date="20260115", amount=-100.50, memo=_MEMO_256AB),
+            _FITID_MEMO_255A
         )
-
-        # Different disambiguation should produce different IDs
-        self.assertNotEqual(fitid1, fitid2)
-
-        # Same disambiguation should produce same ID
-        fitid3 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase",
-            disambiguation="1"
+        # 300 a's are truncated to the same 255 a's
+        self.assertEqual(
+            generate_deterministic_fitid(date="20260115", amount=-100.50, memo=_MEMO_300A),
+            _FITID_MEMO_255A
         )
-        self.assertEqual(fitid2, fitid3)
 
-    def test_generate_deterministic_fitid_empty_fields(self):
-        """Test handling of empty fields."""
-        # Test with empty memo
-        fitid1 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo=""
-        )
-        self.assertIsInstance(fitid1, str)
-        self.assertEqual(len(fitid1), 36)
+    def test_fitid_date_normalization_is_cached(self):
+        """Test that repeated dates are served from the normalization cache."""
+        _normalize_fitid_date("20260115000000[-3:BRT]")
+        hits = _normalize_fitid_date.cache_info().hits
 
-        # Test with empty account_id and disambiguation (defaults)
-        fitid2 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase",
-            account_id="",
-            disambiguation=""
-        )
-        self.assertIsInstance(fitid2, str)
-        self.assertEqual(len(fitid2), 36)
+        self.assertEqual(_normalize_fitid_date("20260115000000[-3:BRT]"), "20260115")
+        self.assertEqual(_normalize_fitid_date.cache_info().hits, hits + 1)
+        # Only OFX datetimes at midnight are shortened
+        self.assertEqual(_normalize_fitid_date(" 20260115 "), "20260115")
+        self.assertEqual(_normalize_fitid_date("20260115123000"), "20260115123000")
 
-    def test_generate_deterministic_fitid_positive_amount(self):
-        """Test FITID generation with positive amount."""
-        fitid = generate_deterministic_fitid(
-            date="20260115",
-            amount=100.50,
-            memo="Deposit"
-        )
+    def test_generate_deterministic_fitid_negative_zero(self):
+        """Test that 0.0 and -0.0 keep their own IDs."""
+        positive = generate_deterministic_fitid(date="20260115", amount=0.0, memo="Zero")
+        negative = generate_deterministic_fitid(date="20260115", amount=-0.0, memo="Zero")
 
-        self.assertIsInstance(fitid, str)
-        self.assertEqual(len(fitid), 36)
-
-    def test_generate_deterministic_fitid_zero_amount(self):
-        """Test FITID generation with zero amount."""
-        fitid = generate_deterministic_fitid(
-            date="20260115",
-            amount=0.0,
-            memo="Adjustment"
-        )
-
-        self.assertIsInstance(fitid, str)
-        self.assertEqual(len(fitid), 36)
-
-    def test_generate_deterministic_fitid_large_amount(self):
-        """Test FITID generation with large amount."""
-        fitid = generate_deterministic_fitid(
-            date="20260115",
-            amount=-999999.99,
-            memo="Large payment"
-        )
-
-        self.assertIsInstance(fitid, str)
-        self.assertEqual(len(fitid), 36)
+        # '-0.00' and '0.00' have always hashed differently
+        self.assertNotEqual(positive, negative)
 
     def test_generate_deterministic_fitid_special_characters_in_memo(self):
         """Test FITID generation with special characters in memo."""
@@ -861,79 +592,29 @@ class TestGenerateDeterministicFitid(unittest.TestCase):
         self.assertIsInstance(fitid3, str)
         self.assertEqual(len(fitid3), 36)
 
-    def test_generate_deterministic_fitid_extreme_amounts(self):
-        """Test FITID generation with extreme amounts."""
-        # Very large amount
-        fitid_large = generate_deterministic_fitid(
-            date="20260115",
-            amount=999999999.99,
-            memo="Large transaction"
-        )
-        self.assertIsInstance(fitid_large, str)
-        self.assertEqual(len(fitid_large), 36)
-
-        # Very small amount
-        fitid_small = generate_deterministic_fitid(
-            date="20260115",
-            amount=0.01,
-            memo="Small transaction"
-        )
-        self.assertIsInstance(fitid_small, str)
-        self.assertEqual(len(fitid_small), 36)
-
-        # Zero amount
-        fitid_zero = generate_deterministic_fitid(
-            date="20260115",
-            amount=0.00,
-            memo="Zero transaction"
-        )
-        self.assertIsInstance(fitid_zero, str)
-        self.assertEqual(len(fitid_zero), 36)
-
-        # Negative large amount
-        fitid_neg = generate_deterministic_fitid(
-            date="20260115",
-            amount=-999999999.99,
-            memo="Large negative"
-        )
-        self.assertIsInstance(fitid_neg, str)
-        self.assertEqual(len(fitid_neg), 36)
-
-        # Verify all produce different IDs
-        all_fitids = [fitid_large, fitid_small, fitid_zero, fitid_neg]
-        self.assertEqual(len(set(all_fitids)), 4, "All extreme amounts should produce unique IDs")
+    def test_generate_deterministic_fitid_parametrized(self):
+        """Test FITIDs for extreme amounts and for equivalent OFX date formats."""
+        cases = self._EXTREME_CASES + self._DATE_FORMAT_CASES
+        fitids = [
+            generate_deterministic_fitid(date=date, amount=amount, memo=memo)
+            for date, amount, memo in cases
+        ]
 
-    def test_generate_deterministic_fitid_date_formats(self):
-        """Test FITID generation with various OFX date formats."""
-        # Various OFX date formats
-        fitid1 = generate_deterministic_fitid(
-            date="20260115000000[-3:BRT]",
-            amount=-100.50,
-            memo="Purchase"
-        )
-        self.assertIsInstance(fitid1, str)
-        self.assertEqual(len(fitid1), 36)
+        for (date, amount, memo), fitid in zip(cases, fitids):
+            with self.subTest(date=date, amount=amount, memo=memo):
+                self.assertEqual(len(fitid), 36)
 
-        fitid2 = generate_deterministic_fitid(
-            date="20260115000000",
-            amount=-100.50,
-            memo="Purchase"
+        # Extreme amounts: any collision leaves equal neighbours after sorting
+        ordered = sorted(fitids[:len(self._EXTREME_CASES)])
+        self.assertTrue(
+            all(a < b for a, b in zip(ordered, ordered[1:])),
+            "All extreme amounts should produce unique IDs"
         )
-        self.assertIsInstance(fitid2, str)
-        self.assertEqual(len(fitid2), 36)
-
-        fitid3 = generate_deterministic_fitid(
-            date="20260115",
-            amount=-100.50,
-            memo="Purchase"
+        # Date formats: all extract YYYYMMDD and produce the same ID
+        self.assertEqual(
+            set(fitids[len(self._EXTREME_CASES):]), {_FITID_PURCHASE},
+            "All date formats should normalize to same ID"
         )
-        self.assertIsInstance(fitid3, str)
-        self.assertEqual(len(fitid3), 36)
-
-        # All three should extract YYYYMMDD correctly and produce same ID
-        self.assertEqual(fitid1, fitid2, "OFX format with timezone should match without timezone")
-        self.assertEqual(fitid2, fitid3, "OFX format with time should match date-only format")
-        self.assertEqual(fitid1, fitid3, "All date formats should normalize to same ID")
 
 
 if __name__ == '__main__':